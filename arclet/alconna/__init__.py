@@ -8,9 +8,9 @@ from .arpamar import Arpamar
 from .types import (
     DataUnit, DataCollection, AnyParam, AllParam, Empty,
     AnyStr, AnyIP, AnyUrl, AnyDigit, AnyFloat, Bool, PatternToken, Email, ObjectPattern,
-    add_check
+    MultiArg, SequenceArg, add_check, add_converter
 )
-from .exceptions import ParamsUnmatched, NullTextMessage, InvalidParam, UnexpectedElement
+from .exceptions import ParamsUnmatched, NullTextMessage, InvalidParam, UnexpectedElement, ExceedParseBudget
 from .analysis import compile, analyse, analyse_args, analyse_header, analyse_option, analyse_subcommand
 from .main import Alconna
 from .manager import command_manager
@@ -1,13 +1,14 @@
 from typing import TYPE_CHECKING, Union, Callable, Optional, List, Any, Tuple
 import traceback
 
-from .analyser import Analyser
+from .analyser import Analyser, ParseFailure
 from .arg_handlers import multi_arg_handler, anti_arg_handler, common_arg_handler, union_arg_handler
 from .parts import analyse_args as ala, analyse_header as alh, analyse_option as alo, analyse_subcommand as als
 from ..component import Option, Subcommand
 from ..arpamar import Arpamar
 from ..types import DataCollection, MultiArg, ArgPattern, AntiArg, UnionArg, ObjectPattern, SequenceArg, MappingArg
 from ..base import Args
+from ..util import PrefixTrie
 
 if TYPE_CHECKING:
     from ..main import Alconna
@@ -17,6 +18,7 @@ def compile(alconna: "Alconna", params_generator: Optional[Callable[[Analyser],
     _analyser = alconna.analyser_type(alconna)
     if params_generator:
         params_generator(_analyser)
+        _analyser.build_tries()
     else:
         Analyser.default_params_generator(_analyser)
     return _analyser
@@ -43,6 +45,7 @@ class _DummyAnalyser(Analyser):
         cls.add_arg_handler(SequenceArg, common_arg_handler)
         cls.add_arg_handler(MappingArg, common_arg_handler)
         cls.params = {}
+        cls.params_trie = PrefixTrie()
         return super().__new__(cls)
 
     def analyse(self, message: Union[str, DataCollection, None] = None):
@@ -55,6 +58,13 @@ class _DummyAnalyser(Analyser):
         pass
 
 
+def _unwrap(result):
+    """将解析部件返回的失配状态转为异常抛出"""
+    if result.__class__ is ParseFailure:
+        raise result.to_exception()
+    return result
+
+
 def analyse_args(
         args: Args,
         command: Union[str, DataCollection],
@@ -66,7 +76,7 @@ def analyse_args(
     _analyser.is_raise_exception = True
     try:
         _analyser.handle_message(command)
-        return ala(_analyser, args, sep, len(args))
+        return _unwrap(ala(_analyser, args, sep, len(args)))
     except Exception as e:
         traceback.print_exception(AnalyseError, e, e.__traceback__)
 
@@ -83,7 +93,7 @@ def analyse_header(
     _analyser.is_raise_exception = True
     _analyser.handle_message(command)
     _analyser.__init_header__(command_name, headers)
-    r = alh(_analyser)
+    r = _unwrap(alh(_analyser))
     if r is False:
         traceback.print_exception(
             AnalyseError, AnalyseError(f"header {_analyser.recover_raw_data()} analyse failed"), None
@@ -101,7 +111,7 @@ def analyse_option(
     _analyser.is_raise_exception = True
     try:
         _analyser.handle_message(command)
-        return alo(_analyser, option)
+        return _unwrap(alo(_analyser, option))
     except Exception as e:
         traceback.print_exception(AnalyseError, e, e.__traceback__)
 
@@ -116,6 +126,6 @@ def analyse_subcommand(
     _analyser.is_raise_exception = True
     try:
         _analyser.handle_message(command)
-        return als(_analyser, subcommand)
+        return _unwrap(als(_analyser, subcommand))
     except Exception as e:
         traceback.print_exception(AnalyseError, e, e.__traceback__)
@@ -1,19 +1,56 @@
-import re
+from time import perf_counter
 from abc import ABCMeta, abstractmethod
-from typing import Dict, Union, List, Optional, TYPE_CHECKING, Tuple, Any, Type, Callable
+from typing import Dict, Union, List, Optional, TYPE_CHECKING, Tuple, Any, Type, Callable, Iterator, Sequence
 
 from arclet.alconna import NullTextMessage, UnexpectedElement
 
 from ..base import Args
 from ..component import Option, Subcommand
 from ..arpamar import Arpamar
-from ..util import split_once, split
-from ..types import DataUnit, ArgPattern, DataCollection
+from ..exceptions import ExceedParseBudget
+from ..util import split_once, split, PrefixTrie
+from ..types import DataUnit, DataCollection
+from .tokens import TextSegment, TokenStream
+from .header import HeaderMatcher
 
 if TYPE_CHECKING:
     from ..main import Alconna
 
 
+class ParseFailure:
+    """
+    解析过程中的失配状态
+
+    各解析部件以返回值的形式报告失配, 只有在需要抛出时才构造对应的异常
+
+    Attributes:
+        exc_type: 失配对应的异常类型
+        message: 异常信息
+    """
+    exc_type: Type[Exception]
+    message: str
+
+    __slots__ = "exc_type", "message"
+
+    def __init__(self, exc_type: Type[Exception], message: str):
+        self.exc_type = exc_type
+        self.message = message
+
+    def to_exception(self) -> Exception:
+        """构造对应的异常"""
+        return self.exc_type(self.message)
+
+    def __repr__(self):
+        return f"ParseFailure({self.exc_type.__name__}, {self.message!r})"
+
+
+# 消息元素的处理方式; UNIT_TEXT 可与其余三者组合, 表示 text 属性为空时再按其余方式处理
+UNIT_STR = 1  # 作为文本切分
+UNIT_ELEMENT = 2  # 原样保留
+UNIT_FILTERED = 3  # 被过滤
+UNIT_TEXT = 4  # 提取 text 属性中的文本
+
+
 class Analyser(metaclass=ABCMeta):
     """
     Alconna使用的分析器基类, 实现了一些通用的方法
@@ -27,17 +64,20 @@ class Analyser(metaclass=ABCMeta):
     current_index: int  # 当前数据的index
     content_index: int  # 内部index
     is_str: bool  # 是否是字符串
-    raw_data: Dict[int, Union[List[str], Any]]  # 原始数据
+    raw_data: Dict[int, Union[TextSegment, Any]]  # 原始数据
+    rest_texts: Dict[Tuple[int, int], str]  # 被其他分隔符切分后剩余的文本
+    unit_counts: Dict[Optional[str], Tuple[List[int], List[Optional[List[int]]]]]  # 各分隔符下的 token 计数
     ndata: int  # 原始数据的长度
     params: Dict[str, Union[Option, Subcommand, Args]]  # 参数
-    # 命令头部
-    command_header: Union[
-        ArgPattern,
-        Tuple[Union[Tuple[List[Any], ArgPattern], List[Any]], ArgPattern],
-        List[Tuple[Any, ArgPattern]]
-    ]
+    params_trie: PrefixTrie  # 参数名称与别名的前缀树
+    command_header: HeaderMatcher  # 命令头部
     separator: str  # 分隔符
     is_raise_exception: bool  # 是否抛出异常
+    max_steps: Optional[int] = None  # 单次解析最多读取数据的次数
+    max_time: Optional[float] = None  # 单次解析最长的耗时
+    budgeted: bool = False  # 是否限制了解析预算
+    steps: int  # 本次解析已读取数据的次数
+    deadline: Optional[float]  # 本次解析的截止时间
     options: Dict[str, Any]  # 存放解析到的所有选项
     subcommands: Dict[str, Any]  # 存放解析到的所有子命令
     main_args: Dict[str, Any]  # 主参数
@@ -49,24 +89,31 @@ class Analyser(metaclass=ABCMeta):
     self_args: Args  # 自身参数
     ARGHANDLER_TYPE = Callable[["Analyser", Union[str, DataUnit], str, Type, Any, int, str, Dict[str, Any], bool], Any]
     arg_handlers: Dict[Type, ARGHANDLER_TYPE]
+    handler_version: int = 0  # arg_handlers 的版本, 用于使 Args 的解析计划失效
     filter_out: List[str]  # 元素黑名单
+    unit_kinds: Dict[type, int]  # 各类型消息元素的处理方式, 按分析器类型缓存
+    filter_set: frozenset  # filter_out 的集合形式
 
     def __init_subclass__(cls, **kwargs):
         cls.arg_handlers = {}
+        cls.unit_kinds = {}
         for base in reversed(cls.__bases__):
             if issubclass(base, Analyser):
                 cls.arg_handlers.update(getattr(base, "arg_handlers", {}))
         if not hasattr(cls, "filter_out"):
             raise TypeError("Analyser subclass must define filter_out")
+        cls.filter_set = frozenset(cls.filter_out)
 
     @classmethod
     def add_arg_handler(cls, arg_type: Type, handler: Optional[ARGHANDLER_TYPE] = None):
         if handler:
             cls.arg_handlers[arg_type] = handler
+            cls.handler_version += 1
             return handler
 
         def __wrapper(func):
             cls.arg_handlers[arg_type] = func
+            cls.handler_version += 1
             return func
 
         return __wrapper
@@ -77,6 +124,9 @@ class Analyser(metaclass=ABCMeta):
         self.self_args = alconna.args
         self.separator = alconna.separator
         self.is_raise_exception = alconna.is_raise_exception
+        self.max_steps = alconna.max_steps
+        self.max_time = alconna.max_time
+        self.budgeted = self.max_steps is not None or self.max_time is not None
         self.need_main_args = False
         self.default_main_only = False
         self.__handle_main_args__(alconna.args, alconna.nargs)
@@ -98,30 +148,7 @@ class Analyser(metaclass=ABCMeta):
             command_name: str,
             headers: Union[List[Union[str, DataUnit]], List[Tuple[DataUnit, str]]]
     ):
-        if headers != [""]:
-            if isinstance(headers[0], tuple):
-                mixins = []
-                for h in headers:  
-                    mixins.append((h[0], ArgPattern(re.escape(h[1]) + command_name)))  # type: ignore
-                self.command_header = mixins
-            else:
-                elements = []
-                ch_text = ""
-                for h in headers:
-                    if isinstance(h, str):
-                        ch_text += re.escape(h) + "|"
-                    else:
-                        elements.append(h)
-                if not elements:
-                    self.command_header = ArgPattern("(?:{})".format(ch_text[:-1]) + command_name)
-                elif not ch_text:
-                    self.command_header = (elements, ArgPattern(command_name))
-                else:
-                    self.command_header = (
-                        (elements, ArgPattern("(?:{})".format(ch_text[:-1]))), ArgPattern(command_name)
-                    )
-        else:
-            self.command_header = ArgPattern(command_name)
+        self.command_header = HeaderMatcher(command_name, headers)
 
     @staticmethod
     def default_params_generator(analyser: "Analyser"):
@@ -134,6 +161,50 @@ class Analyser(metaclass=ABCMeta):
                 opts.sub_part_len = range(len(opts.options) + opts.nargs)
             analyser.params[opts.name] = opts
         analyser.part_len = range(len(analyser.params) + 1)
+        analyser.build_tries()
+
+    @staticmethod
+    def param_trie(params: Dict[str, Any]) -> PrefixTrie:
+        """
+        构造参数的前缀树
+
+        名称只能完全匹配; 别名 (没有别名时为名称) 还可以作为前缀, 以识别粘连了参数的选项, 如 -n123
+        """
+        trie = PrefixTrie()
+        for name, param in params.items():
+            trie.insert(getattr(param, 'alias', name), param)
+        for name, param in params.items():
+            trie.insert(name, param, prefix=False)
+        return trie
+
+    def build_tries(self):
+        """根据 params 与各子命令的 sub_params 重新构造前缀树, 修改参数后需要调用"""
+        self.params_trie = self.param_trie(self.params)
+        for param in self.params.values():
+            if isinstance(param, Subcommand):
+                param.sub_trie = self.param_trie(param.sub_params)
+
+    def fork(self) -> "Analyser":
+        """
+        派生一个新的解析上下文
+
+        派生出的分析器与原分析器共享编译得到的数据 (params、command_header 等),
+        但拥有独立的解析状态, 因此同一个命令可以在多个线程或协程中被同时解析
+        """
+        context = object.__new__(self.__class__)
+        context.__dict__.update(self.__dict__)
+        context.reset()
+        return context
+
+    def detach(self) -> "Analyser":
+        """
+        派生一个保留当前解析进度的分析器
+
+        reset 只会重新绑定解析状态而不会修改原有的对象, 因此派生出的分析器在原分析器被重置后仍能还原数据
+        """
+        context = object.__new__(self.__class__)
+        context.__dict__.update(self.__dict__)
+        return context
 
     def __repr__(self):
         return f"<{self.__class__.__name__}>"
@@ -151,25 +222,34 @@ class Analyser(metaclass=ABCMeta):
         self.subcommands = {}
         self.header = None
         self.raw_data = {}
+        self.rest_texts = {}
+        self.unit_counts = {}
         self.head_matched = False
         self.ndata = 0
+        self.steps = 0
+        self.deadline = None
 
     def next_data(self, separate: Optional[str] = None, pop: bool = True) -> Tuple[Union[str, Any], bool]:
         """获取解析需要的下个数据"""
         if self.current_index == self.ndata:
             return "", True
+        if pop and self.budgeted and self.head_matched:
+            self.spend()
         _current_data = self.raw_data[self.current_index]
-        if isinstance(_current_data, list):
+        if isinstance(_current_data, TextSegment):
             _rest_text: str = ""
-            _text = _current_data[self.content_index]
+            if not self.rest_texts or not (
+                _text := self.rest_texts.get((self.current_index, self.content_index))
+            ):
+                _text = _current_data.get(self.content_index)
             if separate and separate != self.separator:
                 _text, _rest_text = split_once(_text, separate)
             if pop:
-                if _rest_text:  # 这里实际上还是pop了
-                    self.raw_data[self.current_index][self.content_index] = _rest_text
+                if _rest_text:  # 这里实际上还是pop了, 剩余部分记录在rest_texts中
+                    self.rest_texts[(self.current_index, self.content_index)] = _rest_text
                 else:
                     self.content_index += 1
-            if len(_current_data) == self.content_index:
+            if not _current_data.has(self.content_index):
                 self.current_index += 1
                 self.content_index = 0
             return _text, True
@@ -177,19 +257,117 @@ class Analyser(metaclass=ABCMeta):
             self.current_index += 1
         return _current_data, False
 
-    def rest_count(self, separate: Optional[str] = None) -> int:
-        """获取剩余的数据个数"""
-        _result = 0
-        for i in self.raw_data:
-            if i < self.current_index:
+    def iter_data(self, separate: Optional[str] = None, limit: int = -1) -> Iterator[Tuple[Union[str, Any], bool]]:
+        """
+        依次 pop 至多 limit 个数据, 效果等同于重复调用 next_data
+
+        分隔符与命令一致的纯文本段会被整段取出后顺序产出, 不再逐个经过 next_data;
+        迭代中途停止时指针恰好停在最后产出的数据之后, 可直接 reduce_data
+        """
+        if separate == self.separator:
+            separate = None
+        while limit:
+            if self.current_index == self.ndata or separate or self.rest_texts:
+                limit -= 1
+                yield self.next_data(separate)
+                continue
+            _current_data = self.raw_data[self.current_index]
+            if not isinstance(_current_data, TextSegment):
+                limit -= 1
+                yield self.next_data()
                 continue
-            if isinstance(self.raw_data[i], list):
-                for s in self.raw_data[i][self.content_index:]:
-                    if separate and self.separator != separate:
-                        _result += len(split(s, separate))
-                    _result += 1
+            start = self.content_index
+            end = len(_current_data)
+            tokens = _current_data.tokens(start)
+            if limit > 0:
+                tokens = tokens[:limit]
+                limit -= len(tokens)
+            for _text in tokens:
+                if self.budgeted and self.head_matched:
+                    self.spend()
+                start += 1
+                if start == end:
+                    self.current_index += 1
+                    self.content_index = 0
+                else:
+                    self.content_index = start
+                yield _text, True
+
+    def spend(self):
+        """
+        消耗一步解析预算, 超出时抛出 ExceedParseBudget
+
+        预算只在命令头匹配成功后计算; 单次正则匹配无法被中断, 因此预算只在读取数据之间检查,
+        匹配结束后的失配由 timeout 再检查一次
+        """
+        self.steps += 1
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise ExceedParseBudget(f"解析超出了最大步数 {self.max_steps}")
+        if self.max_time is not None:
+            if self.deadline is None:
+                self.deadline = perf_counter() + self.max_time
+            elif exc := self.timeout():
+                raise exc
+
+    def timeout(self) -> Optional[ExceedParseBudget]:
+        """已超出最长时间时返回对应的 ExceedParseBudget, 否则返回 None"""
+        if self.deadline is not None and perf_counter() > self.deadline:
+            return ExceedParseBudget(f"解析超出了最长时间 {self.max_time}s")
+        return None
+
+    def exceed(self, exc: ExceedParseBudget) -> Arpamar:
+        """处理超出解析预算的情况: 需要抛出异常时抛出, 否则返回失败的 Arpamar"""
+        if self.is_raise_exception:
+            raise exc
+        return self.create_arpamar(fail=True, exception=exc)
+
+    def _segment_tokens(self, index: int, start: int) -> List[str]:
+        """获取某段文本从 start 开始的 token, 并应用 rest_texts 中的替换"""
+        tokens = self.raw_data[index].tokens(start)
+        if self.rest_texts:
+            for (i, j), text in self.rest_texts.items():
+                if i == index and j >= start:
+                    tokens[j - start] = text
+        return tokens
+
+    def _count_units(self, separate: Optional[str]) -> Tuple[List[int], List[Optional[List[int]]]]:
+        """统计各段数据在指定分隔符下的 token 数, 返回后缀和与段内前缀和"""
+        prefixes: List[Optional[List[int]]] = []
+        for i in range(self.ndata):
+            _data = self.raw_data[i]
+            if not isinstance(_data, TextSegment):
+                prefixes.append(None)
+            elif separate is None:
+                prefixes.append([len(_data)])
             else:
-                _result += 1
+                _prefix = [0]
+                for s in _data.tokens():
+                    _prefix.append(_prefix[-1] + (len(split(s, separate)) or 1))
+                prefixes.append(_prefix)
+        suffix = [0] * (self.ndata + 1)
+        for i in range(self.ndata - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + (prefixes[i][-1] if prefixes[i] else 1)
+        self.unit_counts[separate] = (suffix, prefixes)
+        return suffix, prefixes
+
+    def rest_count(self, separate: Optional[str] = None) -> int:
+        """获取剩余的数据个数"""
+        if self.current_index == self.ndata:
+            return 0
+        if separate == self.separator:
+            separate = None
+        if not (counts := self.unit_counts.get(separate)):
+            counts = self._count_units(separate)
+        suffix, prefixes = counts
+        index = self.current_index
+        if (prefix := prefixes[index]) is None:
+            return suffix[index]
+        if separate is None:
+            return prefix[0] - self.content_index + suffix[index + 1]
+        _result = prefix[-1] - prefix[self.content_index] + suffix[index + 1]
+        for (i, j), text in self.rest_texts.items():  # 被切分过的 token 需要重新计数
+            if i > index or (i == index and j >= self.content_index):
+                _result += (len(split(text, separate)) or 1) - (prefixes[i][j + 1] - prefixes[i][j])
         return _result
 
     def reduce_data(self, data: Union[str, Any]):
@@ -202,73 +380,215 @@ class Analyser(metaclass=ABCMeta):
                 self.content_index = len(self.raw_data[self.current_index]) - 1
         else:
             _current_data = self.raw_data[self.current_index]
-            if isinstance(_current_data, list) and isinstance(data, str):
+            if isinstance(_current_data, TextSegment) and isinstance(data, str) and self.content_index > 0:
                 self.content_index -= 1
             else:
                 self.current_index -= 1
+                if isinstance(data, str) and isinstance(self.raw_data[self.current_index], TextSegment):
+                    self.content_index = len(self.raw_data[self.current_index]) - 1
 
     def recover_raw_data(self) -> List[Union[str, Any]]:
         """将处理过的命令数据大概还原"""
         _result = []
-        for i in self.raw_data:
-            if i < self.current_index:
-                continue
-            if isinstance(self.raw_data[i], list):
-                _result.append(f'{self.separator}'.join(self.raw_data[i][self.content_index:]))
+        for i in range(self.current_index, self.ndata):
+            _data = self.raw_data[i]
+            if isinstance(_data, TextSegment):
+                start = self.content_index if i == self.current_index else 0
+                if self.rest_texts:
+                    _result.append(f'{self.separator}'.join(self._segment_tokens(i, start)))
+                else:
+                    _result.append(_data.join(start))
             else:
-                _result.append(self.raw_data[i])
+                _result.append(_data)
         self.current_index = self.ndata
         self.content_index = 0
         return _result
 
-    def handle_message(self, data: Union[str, DataCollection]) -> Optional[Arpamar]:
-        """命令分析功能, 传入字符串或消息链, 应当在失败时返回fail的arpamar"""
-        if isinstance(data, str):
-            self.is_str = True
-            if not (res := split(data.lstrip(), self.separator)):
-                if self.is_raise_exception:
-                    raise NullTextMessage("传入了空的字符串")
-                return self.create_arpamar(fail=True, exception=NullTextMessage("传入了空的字符串"))
-            self.raw_data = {0: res}
-            self.ndata = 1
+    @property
+    def token_key(self) -> Tuple[type, str]:
+        """切分方式, 相同时 tokenize 的结果可以共享"""
+        return self.__class__, self.separator
+
+    @classmethod
+    def classify_unit(cls, unit: Any) -> int:
+        """
+        判断一类消息元素的处理方式, 并按元素类型缓存
+
+        缓存在首次遇到该类型时写入; 修改 filter_out 后需要同步更新 filter_set 并清空 unit_kinds
+        """
+        if isinstance(unit, str):
+            kind = UNIT_STR
+        elif unit.__class__.__name__ in cls.filter_set:
+            kind = UNIT_FILTERED
         else:
-            separate = self.separator
-            i, __t, exc = 0, False, None
-            raw_data: Dict[int, Any] = {}
-            for unit in data:  # type: ignore
+            kind = UNIT_ELEMENT
+        if hasattr(unit, 'text'):
+            kind |= UNIT_TEXT
+        cls.unit_kinds[unit.__class__] = kind
+        return kind
+
+    def tokenize(self, data: Union[str, DataCollection]) -> TokenStream:
+        """将字符串或消息链切分为 TokenStream, 不修改解析状态"""
+        if isinstance(data, str):
+            res = TextSegment(data.lstrip(), self.separator)
+            if not res.has(0):
+                return TokenStream(data, self.token_key, {}, True, null=True)
+            return TokenStream(data, self.token_key, {0: res}, True)
+        separate = self.separator
+        i, __t, exc = 0, False, None
+        raw_data: Dict[int, Any] = {}
+        kinds = self.unit_kinds
+        for unit in data:  # type: ignore
+            if (kind := kinds.get(unit.__class__)) is None:
+                kind = self.classify_unit(unit)
+            if kind & UNIT_TEXT:
                 if text := getattr(unit, 'text', None):
-                    if not (res := split(text.lstrip(' '), separate)):
+                    if not (res := TextSegment(text.lstrip(' '), separate)).has(0):
                         continue
                     raw_data[i] = res
                     __t = True
-                elif isinstance(unit, str):
-                    if not (res := split(unit.lstrip(' '), separate)):
-                        continue
-                    raw_data[i] = res
-                    __t = True
-                elif unit.__class__.__name__ not in self.filter_out:
-                    raw_data[i] = unit
-                else:
-                    if self.is_raise_exception:
-                        exc = UnexpectedElement(f"{unit.type}({unit})")
+                    i += 1
                     continue
+                kind &= ~UNIT_TEXT
+            if kind == UNIT_STR:
+                if not (res := TextSegment(unit.lstrip(' '), separate)).has(0):
+                    continue
+                raw_data[i] = res
+                __t = True
+            elif kind == UNIT_ELEMENT:
+                raw_data[i] = unit
+            else:
+                exc = unit
+                continue
+            i += 1
+        return TokenStream(data, self.token_key, raw_data, False, null=__t is False, unexpected=exc)
+
+    def tokenize_tokens(self, tokens: Sequence[Union[str, Any]]) -> TokenStream:
+        """
+        将已切分好的 token 与消息元素直接组织为 TokenStream, 不修改解析状态
+
+        字符串 token 原样使用, 不会再被切分; 连续的字符串 token 合并为一段文本, 空字符串被忽略
+        """
+        i, texts, __t, __e, exc = 0, [], False, False, None
+        raw_data: Dict[int, Any] = {}
+        kinds = self.unit_kinds
+        for unit in tokens:
+            if isinstance(unit, str):
+                if unit:
+                    texts.append(unit)
+                continue
+            __e = True
+            if texts:
+                raw_data[i] = TextSegment.from_tokens(texts, self.separator)
+                i, texts, __t = i + 1, [], True
+            if (kinds.get(unit.__class__) or self.classify_unit(unit)) & ~UNIT_TEXT != UNIT_FILTERED:
+                raw_data[i] = unit
                 i += 1
-            if __t is False:
-                if self.is_raise_exception:
-                    raise NullTextMessage("传入了一个无法获取文本的消息链")
-                return self.create_arpamar(fail=True, exception=NullTextMessage("传入了一个无法获取文本的消息链"))
-            if exc:
-                if self.is_raise_exception:
-                    raise exc
-                return self.create_arpamar(fail=True, exception=exc)
-            self.raw_data = raw_data
-            self.ndata = i
+            else:
+                exc = unit
+        if texts:
+            raw_data[i] = TextSegment.from_tokens(texts, self.separator)
+            __t = True
+        return TokenStream(
+            tokens, self.token_key, raw_data, not __e, null=not __t, unexpected=exc, pretokenized=True
+        )
+
+    def tokenize_shared(
+            self, data: Union[str, DataCollection], streams: Dict[Tuple[type, str], TokenStream]
+    ) -> TokenStream:
+        """从 streams 中取出切分方式相同的 TokenStream, 不存在时切分并存入"""
+        if (stream := streams.get(key := self.token_key)) is None:
+            stream = streams[key] = self.tokenize(data)
+        return stream
+
+    def feed(self, stream: Union[TokenStream, Sequence[Union[str, Any]]]) -> Optional[Arpamar]:
+        """
+        载入切分好的数据, 应当在失败时返回fail的arpamar
+
+        传入 token 序列时经由 tokenize_tokens 组织; stream 的切分方式与本分析器不同时, 以其原始消息重新组织
+        """
+        if stream.__class__ is not TokenStream:
+            stream = self.tokenize_tokens(stream)  # type: ignore
+        elif stream.key != self.token_key:  # type: ignore
+            stream = (self.tokenize_tokens if stream.pretokenized else self.tokenize)(stream.origin)  # type: ignore
+        self.is_str = stream.is_str
+        if stream.null:
+            exc = NullTextMessage("传入了空的字符串" if stream.is_str else "传入了一个无法获取文本的消息链")
+            if self.is_raise_exception:
+                raise exc
+            return self.create_arpamar(fail=True, exception=exc)
+        if stream.unexpected is not None and self.is_raise_exception:
+            raise UnexpectedElement(f"{stream.unexpected.type}({stream.unexpected})")
+        self.raw_data = stream.raw_data
+        self.ndata = stream.ndata
+
+    def handle_message(self, data: Union[str, DataCollection]) -> Optional[Arpamar]:
+        """命令分析功能, 传入字符串或消息链, 应当在失败时返回fail的arpamar"""
+        return self.feed(self.tokenize(data))
+
+    def head_data(self, data: Union[str, DataCollection], count: int) -> List[Tuple[Union[str, Any], bool]]:
+        """
+        按 handle_message 的方式取出消息开头的至多 count 个数据, 不修改解析状态
+
+        纯文本只会被切分到所需的 token 为止
+        """
+        result: List[Tuple[Union[str, Any], bool]] = []
+
+        def take(text: str) -> bool:
+            segment, index = TextSegment(text, self.separator), 0
+            while len(result) < count and segment.has(index):
+                result.append((segment.get(index), True))
+                index += 1
+            return len(result) == count
+
+        if isinstance(data, str):
+            take(data.lstrip())
+            return result
+        kinds = self.unit_kinds
+        for unit in data:
+            if (kind := kinds.get(unit.__class__)) is None:
+                kind = self.classify_unit(unit)
+            if kind & UNIT_TEXT:
+                if text := getattr(unit, 'text', None):
+                    if take(text.lstrip(' ')):
+                        break
+                    continue
+                kind &= ~UNIT_TEXT
+            if kind == UNIT_STR:
+                if take(unit.lstrip(' ')):
+                    break
+            elif kind == UNIT_ELEMENT:
+                result.append((unit, False))
+                if len(result) == count:
+                    break
+        return result
+
+    def probe_header(self, data: Union[str, DataCollection]) -> Any:
+        """
+        只匹配消息的命令头, 不修改解析状态, 也不构造 Arpamar
+
+        Returns:
+            命令名中有捕获组时为捕获结果, 否则为 True; 失配时返回 None
+        """
+        command = self.command_header
+        return command.match(self.head_data(data, 2 if command.paired else 1))
 
     @abstractmethod
     def analyse(self, message: Union[str, DataCollection, None] = None) -> Arpamar:
         """主体解析函数, 应针对各种情况进行解析"""
         pass
 
+    def mismatch(self, failure: ParseFailure) -> Arpamar:
+        """
+        处理解析中途的失配: 需要抛出异常时抛出, 否则返回记录了该异常的失败的 Arpamar
+
+        失配时已超出最长时间的 (如耗时过长的正则匹配), 报告为 ExceedParseBudget
+        """
+        exc = self.timeout() or failure.to_exception()
+        if self.is_raise_exception:
+            raise exc
+        return self.create_arpamar(fail=True, exception=exc)
+
     @abstractmethod
     def create_arpamar(self, exception: Optional[BaseException] = None, fail: bool = False) -> Arpamar:
         """创建arpamar, 其一定是一次解析的最后部分"""
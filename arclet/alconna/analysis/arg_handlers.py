@@ -1,8 +1,7 @@
-import re
 from typing import Union, Dict, Any
 
 from ..types import MultiArg, ArgPattern, DataUnit, PatternToken, AntiArg, Empty, UnionArg
-from .analyser import Analyser
+from .analyser import Analyser, ParseFailure
 from ..exceptions import ParamsUnmatched, ArgumentMissing
 
 
@@ -18,109 +17,114 @@ def multi_arg_handler(
         optional: bool
 ):
     _m_arg_base = value.arg_value
-    if _m_arg_base.__class__ is ArgPattern:
+    _m_pattern = _m_arg_base.__class__ is ArgPattern
+    if _m_pattern:
         if not isinstance(may_arg, str):
             return
     elif isinstance(may_arg, str):
         return
     # 当前args 已经解析 m 个参数， 总共需要 n 个参数，总共剩余p个参数，
     # q = n - m 为剩余需要参数（包括自己）， p - q + 1 为自己可能需要的参数个数
+    # 其后的 n - m - 1 个必需参数在此预留, 遇到选项名而提前停止时再从末尾归还
     _m_rest_arg = nargs - len(result_dict) - 1
-    _m_all_args_count = analyser.rest_count(sep) - _m_rest_arg + 1
+    _m_all_args_count = max(analyser.rest_count(sep) - _m_rest_arg + 1, 0)
     analyser.reduce_data(may_arg)
+    params = analyser.params
     if value.flag == 'args':
-        result = []
-
-        def __putback(data):
-            analyser.reduce_data(data)
-            for ii in range(min(len(result), _m_rest_arg)):
-                analyser.reduce_data(result.pop(-1))
-
-        for i in range(_m_all_args_count):
-            _m_arg, _m_str = analyser.next_data(sep)
-            if _m_str and _m_arg in analyser.params:
-                __putback(_m_arg)
-                break
-            if _m_arg_base.__class__ is ArgPattern:
+        result = value.new_result()
+        _m_stop = None
+        if _m_pattern:
+            match = _m_arg_base.match
+            raw = _m_arg_base.pattern
+            for _m_arg, _m_str in analyser.iter_data(sep, _m_all_args_count):
+                if _m_str and _m_arg in params:
+                    _m_stop = _m_arg
+                    break
                 if not _m_str:
                     analyser.reduce_data(_m_arg)
                     break
-                _m_arg_find = _m_arg_base.find(_m_arg)
+                _m_arg_find, _m_arg_value = match(_m_arg)
                 if not _m_arg_find:
                     analyser.reduce_data(_m_arg)
                     break
-                if _m_arg_base.token == PatternToken.REGEX_TRANSFORM and isinstance(_m_arg_find, str):
-                    _m_arg_find = _m_arg_base.transform_action(_m_arg_find)
-                if _m_arg_find == _m_arg_base.pattern:
-                    _m_arg_find = Ellipsis
-                result.append(_m_arg_find)
-            else:
+                try:
+                    result.append(Ellipsis if _m_arg_value == raw else _m_arg_value)
+                except (OverflowError, TypeError):  # 超出 typecode 的表示范围
+                    analyser.reduce_data(_m_arg)
+                    break
+        else:
+            for _m_arg, _m_str in analyser.iter_data(sep, _m_all_args_count):
                 if _m_str:
-                    __putback(_m_arg)
+                    _m_stop = _m_arg
                     break
-                if _m_arg.__class__ is _m_arg_base:
-                    result.append(_m_arg)
-                elif isinstance(value, type) and isinstance(may_arg, value):
+                if isinstance(_m_arg, _m_arg_base):
                     result.append(_m_arg)
                 else:
                     analyser.reduce_data(_m_arg)
                     break
-        if len(result) == 0:
-            result = [default] if default else []
-        result_dict[key] = tuple(result)
+        if _m_stop is not None:
+            analyser.reduce_data(_m_stop)
+            for _ in range(min(len(result), _m_rest_arg)):
+                # 转换后的值未必是 str, 需按原始数据的种类归还
+                _m_arg = result.pop()
+                analyser.reduce_data(_m_arg_base.pattern if _m_pattern else _m_arg)
+        if len(result) == 0 and default:
+            try:
+                result.append(default)
+            except (OverflowError, TypeError):  # 默认值无法存入 typecode 对应的数组
+                return ParseFailure(ParamsUnmatched, f"default {default!r} of {key} is incorrect")
+        result_dict[key] = value.pack_result(result)
     else:
         result = {}
-
-        def __putback(data):
-            analyser.reduce_data(data)
-            for ii in range(min(len(result), _m_rest_arg)):
-                arg = result.popitem()  # type: ignore
-                analyser.reduce_data(arg[0] + '=' + arg[1])
-
-        for i in range(_m_all_args_count):
-            _m_arg, _m_str = analyser.next_data(sep)
-            if _m_str and _m_arg in analyser.params:
-                __putback(_m_arg)
-                break
-            if _m_arg_base.__class__ is ArgPattern:
+        _m_stop = None
+        if _m_pattern:
+            match = _m_arg_base.match
+            raw = _m_arg_base.pattern
+            for _m_arg, _m_str in analyser.iter_data(sep, _m_all_args_count):
+                if _m_str and _m_arg in params:
+                    _m_stop = _m_arg
+                    break
                 if not _m_str:
                     analyser.reduce_data(_m_arg)
                     break
-                _kwarg = re.findall(r'^(.*)=(.*)$', _m_arg)
-                if not _kwarg:
+                _key, _eq, _m_value = _m_arg.rpartition('=')
+                if not _eq:
                     analyser.reduce_data(_m_arg)
                     break
-                _key, _m_arg = _kwarg[0]
-                _m_arg_find = _m_arg_base.find(_m_arg)
+                _m_arg_find, _m_arg_value = match(_m_value)
                 if not _m_arg_find:
                     analyser.reduce_data(_m_arg)
                     break
-                if _m_arg_base.token == PatternToken.REGEX_TRANSFORM and isinstance(_m_arg_find, str):
-                    _m_arg_find = _m_arg_base.transform_action(_m_arg_find)
-                if _m_arg_find == _m_arg_base.pattern:
-                    _m_arg_find = Ellipsis
-                result[_key] = _m_arg_find
-            else:
+                result[_key] = Ellipsis if _m_arg_value == raw else _m_arg_value
+            if _m_stop is not None:
+                analyser.reduce_data(_m_stop)
+                for _ in range(min(len(result), _m_rest_arg)):
+                    analyser.reduce_data(result.popitem()[0] + '=')
+        else:
+            # 元素类型的键值对由 "key=" 文本与其后的元素两项数据组成
+            for _ in range(_m_all_args_count):
+                _m_arg, _m_str = analyser.next_data(sep)
+                if not _m_str:
+                    analyser.reduce_data(_m_arg)
+                    break
+                _key, _eq, _ = _m_arg.rpartition('=')
+                if not _eq or _m_arg in params:
+                    _m_stop = _m_arg
+                    break
+                _m_arg, _m_str = analyser.next_data(sep)
                 if _m_str:
-                    _kwarg = re.findall(r'^(.*)=.*?$', _m_arg)
-                    if not _kwarg:
-                        __putback(_m_arg)
-                        break
-                    _key = _kwarg[0]
-                    _m_arg, _m_str = analyser.next_data(sep)
-                    if _m_str:
-                        __putback(_m_arg)
-                        break
-                    if _m_arg.__class__ is _m_arg_base:
-                        result[_key] = _m_arg
-                    elif isinstance(value, type) and isinstance(may_arg, value):
-                        result[_key] = _m_arg
-                    else:
-                        analyser.reduce_data(_m_arg)
-                        break
-                else:
+                    _m_stop = _m_arg
+                    break
+                if not isinstance(_m_arg, _m_arg_base):
                     analyser.reduce_data(_m_arg)
                     break
+                result[_key] = _m_arg
+            if _m_stop is not None:
+                analyser.reduce_data(_m_stop)
+                for _ in range(min(len(result), _m_rest_arg)):
+                    _key, _m_arg = result.popitem()
+                    analyser.reduce_data(_m_arg)
+                    analyser.reduce_data(_key + '=')
         if len(result) == 0:
             result = [default] if default else []
         result_dict[key] = result
@@ -147,7 +151,7 @@ def anti_arg_handler(
             if default is None:
                 if optional:
                     return
-                raise ParamsUnmatched(f"param {may_arg} is incorrect")
+                return ParseFailure(ParamsUnmatched, f"param {may_arg} is incorrect")
             result_dict[key] = None if default is Empty else default
     else:
         if may_arg.__class__ is not _a_arg_base:
@@ -160,9 +164,9 @@ def anti_arg_handler(
             if optional:
                 return
             if may_arg:
-                raise ParamsUnmatched(f"param type {may_arg.__class__} is incorrect")
+                return ParseFailure(ParamsUnmatched, f"param type {may_arg.__class__} is incorrect")
             else:
-                raise ArgumentMissing(f"param {key} is required")
+                return ParseFailure(ArgumentMissing, f"param {key} is required")
 
 
 def union_arg_handler(
@@ -177,44 +181,19 @@ def union_arg_handler(
         optional: bool
 ):
     if not value.anti:
-        not_equal = True
-        not_match = True
-        not_check = True
-        if may_arg in value.for_equal:
-            not_equal = False
-
-        if not_equal:
-            for pat in value.for_match:
-                if arg_find := pat.find(may_arg):
-                    not_match = False
-                    may_arg = arg_find
-                    if pat.token == PatternToken.REGEX_TRANSFORM and isinstance(may_arg, str):
-                        may_arg = pat.transform_action(may_arg)
-                    if may_arg == pat.pattern:
-                        may_arg = Ellipsis  # type: ignore
-                    break
-        if not_match:
-            for t in value.for_type_check:
-                if isinstance(may_arg, t):
-                    not_check = False
-                    break
-        result = all([not_equal, not_match, not_check])
+        result = False
+        if not value.equals(may_arg):
+            pat, arg_find = value.match_pattern(may_arg)
+            if pat is not None:
+                may_arg = Ellipsis if arg_find == pat.pattern else arg_find
+            else:
+                result = not isinstance(may_arg, tuple(value.for_type_check))
     else:
-        equal = False
-        match = False
-        type_check = False
-        if may_arg in value.for_equal:
-            equal = True
-        for pat in value.for_match:
-            if pat.find(may_arg):
-                match = True
-                break
-        for t in value.for_type_check:
-            if isinstance(may_arg, t):
-                type_check = True
-                break
-
-        result = any([equal, match, type_check])
+        result = (
+            value.equals(may_arg) or
+            value.match_pattern(may_arg, transform=False)[0] is not None or
+            isinstance(may_arg, tuple(value.for_type_check))
+        )
 
     if result:
         analyser.reduce_data(may_arg)
@@ -222,9 +201,9 @@ def union_arg_handler(
             if optional:
                 return
             if may_arg:
-                raise ParamsUnmatched(f"param {may_arg} is incorrect")
+                return ParseFailure(ParamsUnmatched, f"param {may_arg} is incorrect")
             else:
-                raise ArgumentMissing(f"param {key} is required")
+                return ParseFailure(ArgumentMissing, f"param {key} is required")
         may_arg = None if default is Empty else default  # type: ignore
     result_dict[key] = may_arg
 
@@ -240,20 +219,19 @@ def common_arg_handler(
         result_dict: Dict[str, Any],
         optional: bool
 ):
-    arg_find = value.find(may_arg)
+    arg_find, arg_value = value.match(may_arg)
     if not arg_find:
         analyser.reduce_data(may_arg)
         if default is None:
             if optional:
                 return
             if may_arg:
-                raise ParamsUnmatched(f"param {may_arg} is incorrect")
+                return ParseFailure(ParamsUnmatched, f"param {may_arg} is incorrect")
             else:
-                raise ArgumentMissing(f"param {key} is required")
-        else:
-            arg_find = None if default is Empty else default
-    if value.token == PatternToken.REGEX_TRANSFORM and isinstance(arg_find, str):
-        arg_find = value.transform_action(arg_find)
-    if arg_find == value.pattern:
-        arg_find = Ellipsis
-    result_dict[key] = arg_find
+                return ParseFailure(ArgumentMissing, f"param {key} is required")
+        arg_value = None if default is Empty else default
+        if value.token == PatternToken.REGEX_TRANSFORM and isinstance(arg_value, str):
+            arg_value = value.transform_action(arg_value)
+    if arg_value == value.pattern:
+        arg_value = Ellipsis
+    result_dict[key] = arg_value
@@ -0,0 +1,299 @@
+"""Alconna 的代码生成后端"""
+import re
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from ..component import Option
+from ..types import ArgPattern, Empty, PatternToken
+from ..util import split
+from .analyser import Analyser
+from .arg_handlers import common_arg_handler
+
+if TYPE_CHECKING:
+    from ..base import Args
+
+FastParser = Callable[[str], Optional[Tuple[Any, Dict[str, Any], Dict[str, Any]]]]
+
+
+class _SourceBuilder:
+    """逐行拼接生成的源码, 并收集源码中引用的常量"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = {"_split": split, "_E": Ellipsis}
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def const(self, prefix: str, value: Any) -> str:
+        """登记一个常量, 返回其在源码中的名字"""
+        name = f"_{prefix}{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+
+def _supported_args(args: "Args", handlers: Dict) -> bool:
+    """仅支持由 common_arg_handler 处理且非仅限关键字的参数"""
+    for unit in args.argument.values():
+        if unit['kwonly'] or handlers.get(unit['value'].__class__) is not common_arg_handler:
+            return False
+    return True
+
+
+def _emit_args(builder: _SourceBuilder, args: "Args", target: str, indent: int):
+    """
+    生成解析一组参数的代码, 结果写入 target 字典
+
+    与 analyse_args + common_arg_handler 的行为一致; 会导致失配的情况一律 return None, 交由通用分析器处理
+    """
+    builder.emit(indent, f"{target} = {{}}")
+    for key, unit in args.argument.items():
+        value: ArgPattern = unit['value']  # type: ignore
+        default = unit['default']
+        match = builder.const("m", value.match)
+        pattern = builder.const("p", value.pattern)
+        builder.emit(indent, 't = tokens[i] if i < n else ""')
+        builder.emit(indent, "if t in _PARAMS:")
+        if default is None:
+            builder.emit(indent + 1, "pass" if unit['optional'] else "return None")
+        else:
+            builder.emit(indent + 1, f"{target}[{key!r}] = {builder.const('d', None if default is Empty else default)}")
+        builder.emit(indent, "else:")
+        builder.emit(indent + 1, f"f, r = {match}(t)")
+        builder.emit(indent + 1, "if f:")
+        builder.emit(indent + 2, "i += 1")
+        builder.emit(indent + 2, f"{target}[{key!r}] = _E if r == {pattern} else r")
+        if default is None:
+            if not unit['optional']:
+                builder.emit(indent + 1, "else:")
+                builder.emit(indent + 2, "return None")
+            continue
+        builder.emit(indent + 1, "else:")
+        fallback = None if default is Empty else default
+        if value.token == PatternToken.REGEX_TRANSFORM and isinstance(fallback, str):
+            transform = builder.const("t", value.transform_action)
+            builder.emit(indent + 2, f"r = {transform}({builder.const('d', fallback)})")
+            builder.emit(indent + 2, f"{target}[{key!r}] = _E if r == {pattern} else r")
+        else:
+            fallback = Ellipsis if fallback == value.pattern else fallback
+            builder.emit(indent + 2, f"{target}[{key!r}] = {builder.const('d', fallback)}")
+
+
+def _option_index(params: Dict[str, Option]) -> Dict[str, int]:
+    """选项名称与别名到选项序号的映射, 与通用分析器一致地经由前缀树查找"""
+    order = list(params.values())
+    trie = Analyser.param_trie(params)
+    return {text: order.index(trie.longest(text)[0]) for opt in order for text in (opt.name, opt.alias)}
+
+
+def generate_source(analyser: "Analyser") -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    为分析器对应的命令生成专用解析函数的源码及其引用的常量
+
+    目前支持: 纯文本的命令头, 不含子命令与 action 的命令, 分隔符一致且参数均由 common_arg_handler 处理的选项与主参数;
+    命令含有不支持的特性时返回 None
+    """
+    alconna = analyser.alconna
+    handlers = analyser.arg_handlers
+    separator = analyser.separator
+    if (
+        analyser.command_header.paired or analyser.budgeted
+        or getattr(alconna, "action", None) or not _supported_args(alconna.args, handlers)
+    ):
+        return None
+    options: List[Option] = []
+    for opt in alconna.options:
+        if (
+            not isinstance(opt, Option) or getattr(opt, "action", None) or opt.separator != separator
+            or not _supported_args(opt.args, handlers)
+        ):
+            return None
+        options.append(opt)
+    params = {opt.name: opt for opt in options}
+    order = list(params.values())
+    prefixes = tuple(opt.alias for opt in order)
+    option_of = _option_index(params)
+
+    builder = _SourceBuilder()
+    builder.namespace.update(
+        _PARAMS=frozenset(params), _OPTION_OF=option_of, _PREFIXES=prefixes, _SEP=separator
+    )
+    emit = builder.emit
+    emit(0, "def fast_parse(text):")
+    emit(1, "tokens = _split(text.lstrip(), _SEP)")
+    emit(1, "n = len(tokens)")
+    emit(1, "if not n:")
+    emit(2, "return None")
+    emit(1, "t = tokens[0]")
+    header = analyser.command_header.text
+    if header.table is not None:  # type: ignore
+        # 纯字面量的命令头直接与所有可能的组合比较
+        heads = builder.const("h", header.table)  # type: ignore
+        emit(1, f"if t not in {heads}:")
+        emit(2, "return None")
+        emit(1, "header = True")
+    else:
+        emit(1, f"if not (h := {builder.const('h', header.find)}(t)):")
+        emit(2, "return None")
+        emit(1, "header = h if h != t else True")
+    emit(1, "i = 1")
+    emit(1, "main_args = {}")
+    emit(1, "options = {}")
+    emit(1, f"for _ in range({len(params) + 1}):")
+    emit(2, 't = tokens[i] if i < n else ""')
+    emit(2, "k = _OPTION_OF.get(t)")
+    emit(2, "if k is None:")
+    emit(3, "if t and t.startswith(_PREFIXES):")
+    emit(4, "return None")
+    emit(3, "if not main_args:")
+    _emit_args(builder, alconna.args, "main_args", 4)
+    for index, opt in enumerate(order):
+        emit(2, f"elif k == {index}:")
+        if opt.name == "--help":
+            emit(3, "return None")
+            continue
+        emit(3, "i += 1")
+        if opt.nargs == 0:
+            emit(3, "v = _E")
+        else:
+            _emit_args(builder, opt.args, "v", 3)
+        name = opt.name.lstrip("-")
+        emit(3, f"if not (o := options.get({name!r})):")
+        emit(4, f"options[{name!r}] = v")
+        emit(3, "elif o.__class__ is dict:")
+        emit(4, f"options[{name!r}] = [o, v]")
+        emit(3, "elif o.__class__ is list:")
+        emit(4, "o.append(v)")
+        emit(3, "else:")
+        emit(4, "return None")
+    emit(2, "if i == n:")
+    emit(3, "break")
+    if analyser.default_main_only:
+        emit(1, "if not main_args:")
+        emit(2, "return None")
+    if analyser.need_main_args:
+        emit(1, "if i == n and main_args:")
+    else:
+        emit(1, "if i == n:")
+    emit(2, "return header, main_args, options")
+    emit(1, "return None")
+    return "\n".join(builder.lines), builder.namespace
+
+
+def compile_parser(analyser: "Analyser") -> Optional[FastParser]:
+    """生成并编译专用解析函数; 命令含有不支持的特性时返回 None"""
+    if not (generated := generate_source(analyser)):
+        return None
+    source, namespace = generated
+    exec(compile(source, f"<alconna:{analyser.alconna.name}>", "exec"), namespace)
+    return namespace["fast_parse"]
+
+
+def generate_regex(analyser: "Analyser") -> Optional[Tuple[str, List[Tuple[str, ArgPattern]], Dict[str, str]]]:
+    """
+    将结构属于正则语言的命令整体翻译为一个带命名组的正则表达式
+
+    目前支持: 命令头, 必需的位置参数与无参数的选项, 且均不含 action; 命令含有不支持的特性时返回 None
+
+    Returns:
+        正则表达式, 各位置参数的 (参数名, ArgPattern), 选项文本到结果键名的映射
+    """
+    alconna = analyser.alconna
+    separator = analyser.separator
+    if (
+        analyser.command_header.paired or analyser.budgeted or len(separator) != 1
+        or getattr(alconna, "action", None)
+    ):
+        return None
+    params: Dict[str, Option] = {}
+    for opt in alconna.options:
+        if not isinstance(opt, Option) or opt.nargs or getattr(opt, "action", None):
+            return None
+        params[opt.name] = opt
+    order = list(params.values())
+    # --help 交由通用分析器处理
+    flags = {
+        text: order[index].name.lstrip("-")
+        for text, index in _option_index(params).items() if order[index].name != "--help"
+    }
+    sep = re.escape(separator)
+    # 引号、转义符与换行符需要 split 的完整切分, 不在快速路径中处理
+    token = f"[^{sep}'\"\\\\\n\r]+"
+    if (table := analyser.command_header.text.table) is not None:  # type: ignore
+        heads = sorted(table, key=len, reverse=True)
+        regex = "\\s*(?:{})".format("|".join(map(re.escape, heads)))
+    else:
+        regex = f"\\s*(?P<head>{token})"
+    # 通用分析器会把与选项名相同或以选项别名开头的文本视为选项
+    not_option = ""
+    if params:
+        names = "|".join(re.escape(name) for name in params)
+        aliases = "|".join(re.escape(opt.alias) for opt in order)
+        not_option = f"(?!{aliases}|(?:{names})(?:{sep}|$))"
+    units: List[Tuple[str, ArgPattern]] = []
+    for key, unit in alconna.args.argument.items():
+        value = unit['value']
+        if (
+            value.__class__ is not ArgPattern or unit['kwonly'] or unit['optional'] or unit['default'] is not None
+        ):
+            return None
+        regex += f"{sep}+(?P<a{len(units)}>{not_option}"
+        if value.token != PatternToken.DIRECT:
+            # 先行断言只用于尽早排除不匹配的消息, 参数的最终结果仍由 ArgPattern.match 给出
+            regex += f"(?=(?:{value.pattern})(?:{sep}|$))"
+        regex += f"{token})"
+        units.append((key, value))
+    if flags:
+        names = "|".join(map(re.escape, sorted(flags, key=len, reverse=True)))
+        regex += f"(?P<flags>(?:{sep}+(?:{names})(?={sep}|$))*)"
+    return regex + f"{sep}*", units, flags
+
+
+def compile_regex(analyser: "Analyser") -> Optional[FastParser]:
+    """生成基于单次 fullmatch 的解析函数; 命令含有不支持的特性或正则无法编译时返回 None"""
+    if not (generated := generate_regex(analyser)):
+        return None
+    regex, units, flags = generated
+    try:
+        compiled = re.compile(regex)
+    except re.error:
+        return None
+    fullmatch = compiled.fullmatch
+    groups = compiled.groupindex
+    head = groups.get("head", 0) - 1
+    find = analyser.command_header.text.find  # type: ignore
+    tail = groups.get("flags", 0) - 1
+    # 以 groups() 中的下标取值; DIRECT 的参数原样取用, 不必再次匹配
+    plan = tuple(
+        (groups[f"a{index}"] - 1, key, None if value.token == PatternToken.DIRECT else value.match, value.pattern)
+        for index, (key, value) in enumerate(units)
+    )
+    separator = analyser.separator
+
+    def fast_parse(text: str):
+        if not (matched := fullmatch(text)):
+            return None
+        values = matched.groups()
+        header = True
+        if head >= 0:
+            if not (header := find(values[head])):
+                return None
+            if header == values[head]:
+                header = True
+        main_args = {}
+        for index, key, match, pattern in plan:
+            value = values[index]
+            if match:
+                found, value = match(value)
+                if not found:
+                    return None
+            main_args[key] = Ellipsis if value == pattern else value
+        options = {}
+        if tail >= 0 and values[tail]:
+            for flag in values[tail].split(separator):
+                if flag:
+                    if (name := flags[flag]) in options:
+                        return None
+                    options[name] = Ellipsis
+        return header, main_args, options
+
+    return fast_parse
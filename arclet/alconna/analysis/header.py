@@ -0,0 +1,159 @@
+"""Alconna 的命令头匹配相关"""
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..types import ArgPattern, DataUnit
+from ..util import PrefixTrie, literal_prefix
+
+
+class TextHeads:
+    """
+    一组文本前缀与命令名的组合, 相当于正则表达式 (?:h1|h2|...)command
+
+    命令名为字面量时直接查表; 否则在前缀树上找出所有可作为前缀的命令头, 按声明顺序逐个尝试,
+    剩余部分交由命令名的正则匹配, 因此命令名中的捕获组仍然可用, 且与正则分支的匹配顺序一致
+    """
+    __slots__ = "command", "table", "trie", "groups"
+
+    def __init__(self, texts: List[str], command: str):
+        # 命令头会与每条消息的首个 token 匹配, 取值过于分散, 故不缓存匹配结果
+        self.command = ArgPattern(command, cache_size=0)
+        self.groups = self.command.re_pattern.groups
+        self.table = None
+        self.trie = None
+        if literal_prefix(command) == command:
+            self.table = frozenset(text + command for text in texts)
+        else:
+            self.trie = PrefixTrie()
+            for index, text in enumerate(texts):  # 重复的命令头以首次声明的序号为准
+                self.trie.insert(text, index)
+
+    def find(self, text: str) -> Any:
+        """
+        匹配一个 token
+
+        Returns:
+            命令名中没有捕获组时为 text 本身, 否则为捕获的结果; 失配时返回 None
+        """
+        if self.table is not None:
+            return text if text in self.table else None
+        for _, end in sorted(self.trie.prefixes(text)):  # type: ignore
+            found = self.command.find(text[end:])
+            if self.groups == 0:
+                if found is not None:
+                    return text
+            elif found:
+                return found
+        return None
+
+
+class ElementIndex:
+    """
+    元素命令头的索引
+
+    先按身份查找, 再按哈希查找; 不可哈希的元素按类型分桶后逐个比较
+    """
+    __slots__ = "_ids", "_hashed", "_buckets"
+
+    def __init__(self):
+        self._ids: Dict[int, Tuple[DataUnit, Any]] = {}
+        self._hashed: Dict[DataUnit, Any] = {}
+        self._buckets: Dict[type, List[Tuple[DataUnit, Any]]] = {}
+
+    def setdefault(self, element: DataUnit, value: Any) -> Any:
+        """获取元素对应的值, 元素不存在时先写入 value"""
+        if (exist := self.get(element)) is not None:
+            return exist
+        self._ids[id(element)] = (element, value)
+        try:
+            self._hashed[element] = value
+        except TypeError:
+            self._buckets.setdefault(element.__class__, []).append((element, value))
+        return value
+
+    def get(self, element: DataUnit) -> Any:
+        """获取与元素相等的命令头对应的值, 不存在时返回 None"""
+        if (entry := self._ids.get(id(element))) and entry[0] is element:
+            return entry[1]
+        try:
+            return self._hashed.get(element)
+        except TypeError:
+            for exist, value in self._buckets.get(element.__class__, ()):
+                if exist == element:
+                    return value
+        return None
+
+    def __len__(self):
+        return len(self._ids)
+
+
+class HeaderMatcher:
+    """
+    预编译的命令头匹配器
+
+    只有文本命令头时, 命令头与命令名位于同一个 token 中, 由 text 匹配;
+    含有元素命令头时, 命令头 (元素或文本) 与命令名分属两个 token, 由 heads 找到命令头对应的 TextHeads 再匹配命令名
+
+    Attributes:
+        paired: 命令头与命令名是否分属两个 token
+    """
+    paired: bool
+    text: Optional[TextHeads]
+
+    __slots__ = "paired", "text", "texts", "elements"
+
+    def __init__(
+            self,
+            command_name: str,
+            headers: Union[List[Union[str, DataUnit]], List[Tuple[DataUnit, str]]]
+    ):
+        self.text = None
+        self.texts: Dict[str, TextHeads] = {}
+        self.elements = ElementIndex()
+        self.paired = True
+        if headers == [""] or all(isinstance(h, str) for h in headers):
+            self.paired = False
+            self.text = TextHeads(headers or [""], command_name)  # type: ignore
+        elif isinstance(headers[0], tuple):
+            # 同一元素的多个文本前缀合并为一个 TextHeads
+            grouped: List[Tuple[DataUnit, List[str]]] = []
+            seen = ElementIndex()
+            for element, text in headers:  # type: ignore
+                if (texts := seen.get(element)) is None:
+                    grouped.append((element, seen.setdefault(element, [])))
+                    texts = grouped[-1][1]
+                texts.append(text)
+            for element, texts in grouped:
+                self.elements.setdefault(element, TextHeads(texts, command_name))
+        else:
+            command = TextHeads([""], command_name)
+            for h in headers:
+                if isinstance(h, str):
+                    self.texts[h] = command
+                else:
+                    self.elements.setdefault(h, command)
+
+    def heads(self, head: Union[str, DataUnit], is_str: bool) -> Optional[TextHeads]:
+        """命令头与命令名分属两个 token 时, 获取命令头对应的 TextHeads, 不存在时返回 None"""
+        return self.texts.get(head) if is_str else self.elements.get(head)  # type: ignore
+
+    def match(self, data: List[Tuple[Union[str, DataUnit], bool]]) -> Any:
+        """
+        匹配消息开头的数据
+
+        Args:
+            data: 消息开头的 (数据, 是否为文本), 命令头与命令名分属两个 token 时需要两个
+        Returns:
+            命令名中有捕获组时为捕获结果, 否则为 True; 失配时返回 None
+        """
+        if not self.paired:
+            if data and data[0][1] and (found := self.text.find(data[0][0])):  # type: ignore
+                return found if found != data[0][0] else True
+        elif (
+            len(data) > 1 and data[1][1] and (heads := self.heads(*data[0]))
+            and (found := heads.find(data[1][0]))  # type: ignore
+        ):
+            return found if found != data[1][0] else True
+        return None
+
+    def __repr__(self):
+        return f"<HeaderMatcher paired={self.paired}>"
@@ -1,11 +1,10 @@
-import re
 from typing import Iterable, Union, Optional, List, Any, Dict, cast
 import asyncio
 
-from .analyser import Analyser
+from .analyser import Analyser, ParseFailure
 from ..component import Option, Subcommand
 from ..exceptions import ParamsUnmatched, ArgumentMissing
-from ..types import ArgPattern, AnyParam, AllParam, Empty
+from ..types import AnyParam, AllParam, Empty
 from ..base import Args, ArgAction
 
 
@@ -22,7 +21,7 @@ def analyse_args(
         sep: str,
         nargs: int,
         action: Optional[ArgAction] = None,
-) -> Dict[str, Any]:
+) -> Union[Dict[str, Any], ParseFailure]:
     """
     分析 Args 部分
 
@@ -34,44 +33,47 @@ def analyse_args(
         action: 当前命令节点的ArgAction
 
     Returns:
-        Dict: 解析结果
+        Dict: 解析结果, 失配时返回 ParseFailure
     """
     option_dict: Dict[str, Any] = {}
-    for key, arg in opt_args.argument.items():
-        value = arg['value']
-        default = arg['default']
-        kwonly = arg['kwonly']
-        optional = arg['optional']
+    params = analyser.params
+    for spec in opt_args.plan(analyser.__class__, analyser.handler_version, analyser.arg_handlers):
+        key = spec.name
         may_arg, _str = analyser.next_data(sep)
-        if kwonly:
-            _kwarg = re.findall(f'^{key}=(.*)$', may_arg)
+        if spec.kw_pattern:
+            _kwarg = spec.kw_pattern.match(may_arg)
             if not _kwarg:
                 analyser.reduce_data(may_arg)
                 if analyser.is_raise_exception:
-                    raise ParamsUnmatched(f"{may_arg} missing its key. Do you forget to add '{key}='?")
+                    return ParseFailure(
+                        ParamsUnmatched, f"{may_arg} missing its key. Do you forget to add '{key}='?"
+                    )
                 continue
-            may_arg = _kwarg[0]
+            may_arg = _kwarg.group(1)
             if may_arg == '':
                 may_arg, _str = analyser.next_data(sep)
                 if _str:
                     analyser.reduce_data(may_arg)
                     if analyser.is_raise_exception:
-                        raise ParamsUnmatched(f"param type {may_arg.__class__} is incorrect")
+                        return ParseFailure(ParamsUnmatched, f"param type {may_arg.__class__} is incorrect")
                     continue
-        if may_arg in analyser.params:
+        value = spec.value
+        if may_arg in params:
             analyser.reduce_data(may_arg)
-            if default is None:
-                if optional:
+            if spec.default is None:
+                if spec.optional:
                     continue
-                raise ArgumentMissing(f"param {key} is required")
+                return ParseFailure(ArgumentMissing, f"param {key} is required")
             else:
-                option_dict[key] = None if default is Empty else default
-        elif value.__class__ in analyser.arg_handlers:
-            analyser.arg_handlers[value.__class__](
+                option_dict[key] = spec.fallback
+        elif spec.handler:
+            failure = spec.handler(
                 analyser, may_arg, key, value,
-                default, nargs, sep, option_dict,
-                optional
+                spec.default, nargs, sep, option_dict,
+                spec.optional
             )
+            if failure.__class__ is ParseFailure:
+                return failure
         elif value is AnyParam:
             if may_arg:
                 option_dict[key] = may_arg
@@ -90,17 +92,17 @@ def analyse_args(
                 option_dict[key] = may_arg
             elif isinstance(value, type) and isinstance(may_arg, value):
                 option_dict[key] = may_arg
-            elif default is not None:
-                option_dict[key] = None if default is Empty else default
+            elif spec.default is not None:
+                option_dict[key] = spec.fallback
                 analyser.reduce_data(may_arg)
             else:
                 analyser.reduce_data(may_arg)
-                if optional:
+                if spec.optional:
                     continue
                 if may_arg:
-                    raise ParamsUnmatched(f"param type {may_arg.__class__} is incorrect")
+                    return ParseFailure(ParamsUnmatched, f"param type {may_arg.__class__} is incorrect")
                 else:
-                    raise ArgumentMissing(f"param {key} is required")
+                    return ParseFailure(ArgumentMissing, f"param {key} is required")
     if action:
         result_dict = option_dict.copy()
         kwargs = {}
@@ -142,18 +144,27 @@ def analyse_args(
 def analyse_option(
         analyser: Analyser,
         param: Option,
-) -> List[Any]:
+) -> Union[List[Any], ParseFailure]:
     """
     分析 Option 部分
 
     Args:
         analyser: 使用的分析器
         param: 目标Option
+    Returns:
+        选项名称与解析结果, 失配时返回 ParseFailure
     """
 
     name, _ = analyser.next_data(param.separator)
     if name not in (param.name, param.alias):  # 先匹配选项名称
-        raise ParamsUnmatched(f"{name} dose not matched with {param.name}")
+        if not (
+            param.nargs and param.separator == analyser.separator and name.__class__ is str
+            and name.startswith(param.alias)
+        ):
+            return ParseFailure(ParamsUnmatched, f"{name} dose not matched with {param.name}")
+        # 粘连了参数的选项, 如 -n123: 选项名之后的部分放回原位, 作为选项参数继续解析
+        analyser.reduce_data(name)
+        analyser.rest_texts[(analyser.current_index, analyser.content_index)] = name[len(param.alias):]
     name = param.name.lstrip("-")
     if param.nargs == 0:
         if param.action:
@@ -174,23 +185,28 @@ def analyse_option(
                 r = param.action.handle({}, [], analyser.alconna.local_args.copy(), analyser.is_raise_exception)
             return [name, r]
         return [name, Ellipsis]
-    return [name, analyse_args(analyser, param.args, param.separator, param.nargs, param.action)]
+    args = analyse_args(analyser, param.args, param.separator, param.nargs, param.action)
+    if args.__class__ is ParseFailure:
+        return args  # type: ignore
+    return [name, args]
 
 
 def analyse_subcommand(
         analyser: Analyser,
         param: Subcommand
-) -> List[Union[str, Any]]:
+) -> Union[List[Union[str, Any]], ParseFailure]:
     """
     分析 Subcommand 部分
 
     Args:
         analyser: 使用的分析器
         param: 目标Subcommand
+    Returns:
+        子命令名称与解析结果, 失配时返回 ParseFailure
     """
     name, _ = analyser.next_data(param.separator)
     if param.name != name:
-        raise ParamsUnmatched(f"{name} dose not matched with {param.name}")
+        return ParseFailure(ParamsUnmatched, f"{name} dose not matched with {param.name}")
     name = name.lstrip("-")
     if param.sub_part_len.stop == 0:
         if param.action:
@@ -217,14 +233,11 @@ def analyse_subcommand(
     need_args = True if param.nargs > 0 else False
     for _ in param.sub_part_len:
         text, _str = analyser.next_data(param.separator, pop=False)
-        sub_param = param.sub_params.get(text, None) if _str else Ellipsis
-        if not sub_param and text != "":
-            for sp in param.sub_params:
-                if text.startswith(getattr(param.sub_params[sp], 'alias', sp)):
-                    sub_param = param.sub_params[sp]
-                    break
+        sub_param = param.sub_trie.longest(text)[0] if _str else Ellipsis
         if isinstance(sub_param, Option):
-            opt_n, opt_v = analyse_option(analyser, sub_param)
+            if (opt := analyse_option(analyser, sub_param)).__class__ is ParseFailure:
+                return opt  # type: ignore
+            opt_n, opt_v = opt
             if not subcommand.get(opt_n):
                 subcommand[opt_n] = opt_v
             elif isinstance(subcommand[opt_n], dict):
@@ -232,52 +245,33 @@ def analyse_subcommand(
             else:
                 subcommand[opt_n].append(opt_v)
         elif not args and (args := analyse_args(analyser, param.args, param.separator, param.nargs, param.action)):
+            if args.__class__ is ParseFailure:
+                return args  # type: ignore
             subcommand.update(args)
     if need_args and not args:
-        raise ArgumentMissing(f"\"{name}\" subcommand missed its args")
+        return ParseFailure(ArgumentMissing, f"\"{name}\" subcommand missed its args")
     return [name, subcommand]
 
 
 def analyse_header(
         analyser: Analyser,
-) -> Union[str, bool, None]:
+) -> Union[str, bool, None, ParseFailure]:
     """
     分析命令头部
 
     Args:
         analyser: 使用的分析器
     Returns:
-        head_match: 当命令头内写有正则表达式并且匹配成功的话, 返回匹配结果
+        head_match: 当命令头内写有正则表达式并且匹配成功的话, 返回匹配结果; 失配时返回 ParseFailure
     """
     command = analyser.command_header
     separator = analyser.separator
-    head_text, _str = analyser.next_data(separator)
-    if isinstance(command, ArgPattern):
-        if _str and (_head_find := command.find(head_text)):
-            analyser.head_matched = True
-            return _head_find if _head_find != head_text else True
-    else:
-        may_command, _m_str = analyser.next_data(separator)
-        if _m_str:
-            if isinstance(command, List) and not _str:
-                for _command in command:
-                    if (_head_find := _command[1].find(may_command)) and head_text == _command[0]:
-                        analyser.head_matched = True
-                        return _head_find if _head_find != may_command else True
-            elif isinstance(command[0], list) and not _str:
-                if (_head_find := command[1].find(may_command)) and head_text in command[0]:  # type: ignore
-                    analyser.head_matched = True
-                    return _head_find if _head_find != may_command else True
-            elif _str:
-                if (_command_find := command[1].find(may_command)) and (  # type: ignore
-                    _head_find := command[0][1].find(head_text)
-                    ):  
-                        analyser.head_matched = True
-                        return _command_find if _command_find != may_command else True
-            else:
-                if (_command_find := command[1].find(may_command)) and head_text in command[0][0]:  # type: ignore
-                    analyser.head_matched = True
-                    return _command_find if _command_find != may_command else True
+    head = [analyser.next_data(separator)]
+    if command.paired:
+        head.append(analyser.next_data(separator))
+    if (_head_find := command.match(head)) is not None:
+        analyser.head_matched = True
+        return _head_find
 
     if not analyser.head_matched:
-        raise ParamsUnmatched(f"{head_text} dose not matched")
+        return ParseFailure(ParamsUnmatched, f"{head[0][0]} dose not matched")
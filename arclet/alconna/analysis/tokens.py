@@ -0,0 +1,171 @@
+"""Alconna 的惰性分词相关"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..util import split
+
+
+class TextSegment:
+    """
+    一段文本的惰性切分结果
+
+    不含引号、转义符与换行符的文本只记录每个 token 在原文中的 (start, end) 位置,
+    并且只在被读取时才向后扫描; 其余文本则退回到 split 的完整切分
+
+    Attributes:
+        text: 原始文本
+        separator: 切分使用的分隔符
+    """
+    text: str
+    separator: str
+
+    __slots__ = "text", "separator", "_spans", "_pos", "_tokens"
+
+    def __init__(self, text: str, separator: str = " "):
+        self.text = text
+        self.separator = separator
+        self._spans: List[Tuple[int, int]] = []
+        self._pos = 0
+        if (
+            len(separator) != 1 or "'" in text or '"' in text or "\\" in text or "\n" in text or "\r" in text
+        ):
+            self._tokens: Optional[List[str]] = split(text, separator)
+        else:
+            self._tokens = None
+
+    @classmethod
+    def from_tokens(cls, tokens: List[str], separator: str = " ") -> "TextSegment":
+        """由已切分好的 token 直接构造, 不再扫描或切分文本"""
+        segment = cls.__new__(cls)
+        segment.text = separator.join(tokens)
+        segment.separator = separator
+        segment._spans = []
+        segment._pos = len(segment.text)
+        segment._tokens = tokens
+        return segment
+
+    def _scan(self) -> bool:
+        """向后扫描出一个 token, 返回是否成功"""
+        text = self.text
+        sep = self.separator
+        pos = self._pos
+        length = len(text)
+        while pos < length:
+            end = text.find(sep, pos)
+            if end == -1:
+                end = length
+            if end > pos:
+                self._spans.append((pos, end))
+                self._pos = end + 1
+                return True
+            pos = end + 1
+        self._pos = length
+        return False
+
+    def has(self, index: int) -> bool:
+        """判断是否存在第 index 个 token"""
+        if self._tokens is not None:
+            return index < len(self._tokens)
+        spans = self._spans
+        while len(spans) <= index:
+            if not self._scan():
+                return False
+        return True
+
+    def get(self, index: int) -> str:
+        """获取第 index 个 token"""
+        if self._tokens is not None:
+            return self._tokens[index]
+        spans = self._spans
+        while len(spans) <= index:
+            if not self._scan():
+                raise IndexError(index)
+        start, end = spans[index]
+        return self.text[start:end]
+
+    def tokens(self, start: int = 0) -> List[str]:
+        """获取从 start 开始的所有 token"""
+        if self._tokens is not None:
+            return self._tokens[start:]
+        while self._scan():
+            pass
+        text = self.text
+        return [text[s:e] for s, e in self._spans[start:]]
+
+    def join(self, start: int = 0) -> str:
+        """将从 start 开始的所有 token 以分隔符重新连接"""
+        if self._tokens is None and self.has(start):
+            rest = self.text[self._spans[start][0]:]
+            sep = self.separator
+            if sep * 2 not in rest and not rest.endswith(sep):
+                return rest
+        return self.separator.join(self.tokens(start))
+
+    def __len__(self):
+        if self._tokens is not None:
+            return len(self._tokens)
+        while self._scan():
+            pass
+        return len(self._spans)
+
+    def __repr__(self):
+        return f"TextSegment({self.text!r})"
+
+
+class TokenStream:
+    """
+    一条消息经分析器切分后的结果, 可在切分方式相同的多个分析器之间共享
+
+    分析器只读取其中的数据, 解析进度与被其他分隔符切分后剩余的文本均保存在分析器自身;
+    TextSegment 的惰性扫描进度会被共享, 但切分结果不会改变
+
+    Attributes:
+        origin: 原始消息
+        key: 切分方式, 即 (分析器类型, 分隔符)
+        raw_data: 切分后的数据, 不应被修改
+        ndata: 数据的长度
+        is_str: 原始消息是否为字符串
+        null: 消息中是否没有可用的文本
+        unexpected: 最后一个被过滤掉的元素, 没有时为 None
+        pretokenized: 是否由已切分好的 token 组织而来
+    """
+    origin: Any
+    key: Tuple[type, str]
+    raw_data: Dict[int, Any]
+    ndata: int
+    is_str: bool
+    null: bool
+    unexpected: Optional[Any]
+    pretokenized: bool
+
+    __slots__ = "origin", "key", "raw_data", "ndata", "is_str", "null", "unexpected", "pretokenized"
+
+    def __init__(
+            self, origin: Any, key: Tuple[type, str], raw_data: Dict[int, Any], is_str: bool,
+            null: bool = False, unexpected: Optional[Any] = None, pretokenized: bool = False
+    ):
+        self.origin = origin
+        self.key = key
+        self.raw_data = raw_data
+        self.ndata = len(raw_data)
+        self.is_str = is_str
+        self.null = null
+        self.unexpected = unexpected
+        self.pretokenized = pretokenized
+
+    def head(self, count: int) -> List[Tuple[Any, bool]]:
+        """取出开头的至多 count 个数据, 格式与 Analyser.head_data 一致"""
+        result: List[Tuple[Any, bool]] = []
+        for unit in self.raw_data.values():
+            if unit.__class__ is TextSegment:
+                index = 0
+                while len(result) < count and unit.has(index):
+                    result.append((unit.get(index), True))
+                    index += 1
+            else:
+                result.append((unit, False))
+            if len(result) >= count:
+                break
+        return result
+
+    def __repr__(self):
+        return f"TokenStream({self.origin!r}, ndata={self.ndata})"
@@ -1,5 +1,5 @@
 from abc import ABCMeta, abstractmethod
-from typing import Union, Dict, List, Any, Optional, Type, Literal
+from typing import Union, Dict, List, Any, Optional, Type, Literal, Tuple, Callable
 from .types import DataUnit
 from .exceptions import CancelBehave
 
@@ -87,13 +87,17 @@ class Arpamar:
 
         5. `Arpamar.matched`: 返回命令是否匹配成功
 
+        6. `Arpamar.exception`: 解析失败时引发的异常, `Arpamar.error_position` 为失败时所在的数据位置
+
     """
 
     def __init__(self):
         self.matched: bool = False
         self.head_matched: bool = False
-        self.error_data: List[Union[str, Any]] = []
-        self.error_info: Optional[Union[str, BaseException]] = None
+        self.exception: Optional[BaseException] = None
+        self.error_position: Optional[Tuple[int, int]] = None
+        self._error_data: Union[List[Union[str, Any]], Callable[[], List[Union[str, Any]]]] = []
+        self._error_info: Optional[Union[str, BaseException]] = None
 
         self._options: Dict[str, Any] = {}
         self._subcommands: Dict[str, Any] = {}
@@ -104,10 +108,45 @@ class Arpamar:
         self._cache_args = {}
 
     __slots__ = (
-        "matched", "head_matched", "error_data", "error_info", "_options",
+        "matched", "head_matched", "exception", "error_position", "_error_data", "_error_info", "_options",
         "_subcommands", "_other_args", "_header", "_main_args", "_cache_args"
     )
 
+    def fail(
+            self,
+            exception: Optional[BaseException],
+            position: Tuple[int, int],
+            recover: Callable[[], List[Union[str, Any]]]
+    ) -> None:
+        """标记解析失败; 错误信息与剩余数据在首次访问时才生成"""
+        self.matched = False
+        self.exception = exception
+        self.error_position = position
+        self._error_info = ...  # type: ignore
+        self._error_data = recover
+
+    @property
+    def error_info(self) -> Optional[Union[str, BaseException]]:
+        """返回解析失败的原因"""
+        if self._error_info is ...:
+            self._error_info = repr(self.exception)
+        return self._error_info
+
+    @error_info.setter
+    def error_info(self, value: Optional[Union[str, BaseException]]):
+        self._error_info = value
+
+    @property
+    def error_data(self) -> List[Union[str, Any]]:
+        """返回解析失败时剩余的数据"""
+        if callable(self._error_data):
+            self._error_data = self._error_data()
+        return self._error_data
+
+    @error_data.setter
+    def error_data(self, value: List[Union[str, Any]]):
+        self._error_data = value
+
     @property
     def main_args(self):
         """返回可能解析到的 main arguments"""
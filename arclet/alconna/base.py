@@ -22,6 +22,42 @@ class ArgUnit(TypedDict):
     hidden: bool
 
 
+class ArgSpec:
+    """
+    单个参数的解析计划, 由 Args 针对某一分析器预先生成
+
+    Attributes:
+        name: 参数名
+        value: 参数的类型
+        default: 参数的默认值
+        fallback: 使用默认值时实际填入的值
+        optional: 是否可选
+        kw_pattern: 仅限关键字的参数用以匹配 key=value 的表达式
+        handler: 分析器中处理该参数类型的函数
+    """
+    name: str
+    value: TAValue
+    default: TADefault
+    fallback: Any
+    optional: bool
+    kw_pattern: Optional[re.Pattern]
+    handler: Optional[Callable]
+
+    __slots__ = "name", "value", "default", "fallback", "optional", "kw_pattern", "handler"
+
+    def __init__(self, name: str, unit: ArgUnit, handler: Optional[Callable] = None):
+        self.name = name
+        self.value = unit['value']
+        self.default = unit['default']
+        self.fallback = None if self.default is Empty else self.default
+        self.optional = unit['optional']
+        self.kw_pattern = re.compile(f"^{name}=(.*)$") if unit['kwonly'] else None
+        self.handler = handler
+
+    def __repr__(self):
+        return f"ArgSpec({self.name!r}, {self.value!r})"
+
+
 class ArgsMeta(type):
 
     def __init__(cls, name, bases, attrs):
@@ -71,6 +107,7 @@ class Args(metaclass=ArgsMeta):  # type: ignore
     var_positional: Optional[Tuple[str, MultiArg]]
     var_keyword: Optional[Tuple[str, MultiArg]]
     optional_count: int
+    plans: Dict[Type, Tuple[int, Tuple[ArgSpec, ...]]]
 
     @classmethod
     def from_string_list(cls, args: List[List[str]], custom_types: Dict) -> "Args":
@@ -149,21 +186,37 @@ class Args(metaclass=ArgsMeta):  # type: ignore
         self.var_positional = None
         self.var_keyword = None
         self.optional_count = 0
+        self.plans = {}
         self.argument = {  # type: ignore
             k: {"value": argtype_validator(v), "default": None, 'optional': False, 'hidden': False, 'kwonly': False}
             for k, v in kwargs.items()
         }
         self.__check_vars__(args or [])
 
-    __ignore__ = "extra", "var_positional", "var_keyword", "argument", "optional_count"
+    __ignore__ = "extra", "var_positional", "var_keyword", "argument", "optional_count", "plans"
 
     def default(self, **kwargs: TADefault):
         """设置参数的默认值"""
         for k, v in kwargs.items():
             if self.argument.get(k):
                 self.argument[k]['default'] = v
+        self.plans.clear()
         return self
 
+    def plan(self, analyser_type: Type, version: int, handlers: Dict[Type, Callable]) -> Tuple[ArgSpec, ...]:
+        """
+        获取针对某一分析器的解析计划
+
+        计划按分析器类型缓存, 参数变动或分析器的处理函数变动 (version 改变) 后会重新生成
+        """
+        if (cached := self.plans.get(analyser_type)) and cached[0] == version:
+            return cached[1]
+        plan = tuple(
+            ArgSpec(name, unit, handlers.get(unit['value'].__class__)) for name, unit in self.argument.items()
+        )
+        self.plans[analyser_type] = (version, plan)
+        return plan
+
     def __check_vars__(self, args: Iterable[Union[slice, Sequence]]):
         for sl in args:
             if isinstance(sl, slice):
@@ -191,14 +244,16 @@ class Args(metaclass=ArgsMeta):  # type: ignore
                 if self.var_keyword:
                     raise InvalidParam("不能同时设置多个键值对可变参数")
                 if not isinstance(_value, (_AnyParam, UnionArg)):
-                    _value = MultiArg(_value, flag='kwargs')
+                    if not isinstance(_value, MultiArg):
+                        _value = MultiArg(_value, flag='kwargs')
                     self.var_keyword = (name, _value)
             elif name.startswith("*"):
                 name = name.lstrip("*").replace("@", "").replace("?", "")
                 if self.var_positional:
                     raise InvalidParam("不能同时设置多个非键值对可变参数")
                 if not isinstance(_value, (_AnyParam, UnionArg)):
-                    _value = MultiArg(_value)
+                    if not isinstance(_value, MultiArg):
+                        _value = MultiArg(_value)
                     self.var_positional = (name, _value)
             elif name.startswith("!"):
                 name = name.lstrip("!")
@@ -221,6 +276,7 @@ class Args(metaclass=ArgsMeta):  # type: ignore
                 _addition['hidden'] = True
             self.argument[name] = {"value": _value, "default": default}  # type: ignore
             self.argument[name].update(_addition)  # type: ignore
+        self.plans.clear()
 
     def __len__(self):
         return len(self.argument)
@@ -259,6 +315,7 @@ class Args(metaclass=ArgsMeta):  # type: ignore
     def __merge__(self, other) -> "Args":
         if isinstance(other, Args):
             self.argument.update(other.argument)
+            self.plans.clear()
             del other
         elif isinstance(other, Sequence):
             self.__getitem__([other])
@@ -321,6 +378,7 @@ class Args(metaclass=ArgsMeta):  # type: ignore
         self.extra = state["extra"]
         self.var_positional = None
         self.var_keyword = None
+        self.plans = {}
         for k, v in state['argument'].items():
             value = v.pop('value')
             default = v.pop('default')
@@ -65,12 +65,16 @@ def help_send(command: str, help_string_call: Callable[[], str]):
             if action:
                 return await action(help_string_call())
 
-    HelpActionManager.helpers.setdefault(command, _HELP())
+    _help = _HELP()
+    HelpActionManager.helpers.setdefault(command, _help)
     if command in HelpActionManager.cache:
         HelpActionManager.helpers[command].action = HelpActionManager.cache[command]
         HelpActionManager.helpers[command].awaitable = inspect.iscoroutinefunction(HelpActionManager.cache[command])
         del HelpActionManager.cache[command]
-    return HelpActionManager.helpers[command]
+    # 每次调用都返回新的实例, 使 help_string_call 总是对应本次解析
+    _help.action = HelpActionManager.helpers[command].action
+    _help.awaitable = HelpActionManager.helpers[command].awaitable
+    return _help
 
 
 if TYPE_CHECKING:
@@ -1,5 +1,5 @@
-from typing import Union, Optional
-import traceback
+from typing import Union, Optional, Sequence, Any
+from copy import copy
 
 from arclet.alconna.component import Option, Subcommand
 from arclet.alconna.arpamar import Arpamar
@@ -7,13 +7,15 @@ from arclet.alconna.types import (
     DataCollection, MultiArg, ArgPattern, AntiArg, UnionArg, ObjectPattern, SequenceArg, MappingArg
 )
 from arclet.alconna.visitor import AlconnaNodeVisitor
-from arclet.alconna.analysis.analyser import Analyser
+from arclet.alconna.analysis.analyser import Analyser, ParseFailure
 from arclet.alconna.manager import command_manager
 from arclet.alconna.analysis.arg_handlers import (
     multi_arg_handler, common_arg_handler, anti_arg_handler, union_arg_handler
 )
 from arclet.alconna.analysis.parts import analyse_args, analyse_option, analyse_subcommand, analyse_header
-from arclet.alconna.exceptions import ParamsUnmatched, ArgumentMissing
+from arclet.alconna.analysis.codegen import compile_parser, compile_regex, FastParser
+from arclet.alconna.analysis.tokens import TokenStream
+from arclet.alconna.exceptions import ParamsUnmatched, ArgumentMissing, ExceedParseBudget
 from .actions import help_send
 
 
@@ -30,6 +32,7 @@ class DisorderCommandAnalyser(Analyser):
             for sub_opts in opt.options:
                 opt.sub_params.setdefault(sub_opts.name, sub_opts)
         self.params[opt.name] = opt
+        self.build_tries()
 
     def analyse(self, message: Union[str, DataCollection, None] = None) -> Arpamar:
         if command_manager.is_disable(self.alconna):
@@ -39,9 +42,7 @@ class DisorderCommandAnalyser(Analyser):
                 raise ValueError('No data to analyse')
             if r := self.handle_message(message):
                 return r
-        try:
-            self.header = analyse_header(self)
-        except ParamsUnmatched as e:
+        if (header := analyse_header(self)).__class__ is ParseFailure:
             self.current_index = 0
             self.content_index = 0
             try:
@@ -56,21 +57,21 @@ class DisorderCommandAnalyser(Analyser):
                 self.reset()
                 return self.analyse(cmd)
             except ValueError:
-                return self.create_arpamar(fail=True, exception=e)
+                return self.create_arpamar(fail=True, exception=header.to_exception())  # type: ignore
+        self.header = header  # type: ignore
 
         for _ in self.part_len:
             _text, _str = self.next_data(self.separator, pop=False)
-            if not (_param := self.params.get(_text, None) if _str else Ellipsis) and _text != "":
-                for p in self.params:
-                    if _text.startswith(getattr(self.params[p], 'alias', p)):
-                        _param = self.params[p]
-                        break
+            _param = self.params_trie.longest(_text)[0] if _str else Ellipsis
             try:
                 if not _param or _param is Ellipsis:
                     if not self.main_args:
-                        self.main_args = analyse_args(
+                        main_args = analyse_args(
                             self, self.self_args, self.separator, self.alconna.nargs, self.alconna.action
                         )
+                        if main_args.__class__ is ParseFailure:
+                            return self.mismatch(main_args)  # type: ignore
+                        self.main_args = main_args  # type: ignore
                 elif isinstance(_param, Option):
                     if _param.name == "--help":
                         def _get_help():
@@ -80,12 +81,13 @@ class DisorderCommandAnalyser(Analyser):
                                 visitor.require(self.recover_raw_data())
                             )
 
-                        _param.action = help_send(
-                            self.alconna.name, _get_help
-                        )
-                        analyse_option(self, _param)
+                        _help_option = copy(_param)  # 不修改共享的 Option, 以免影响其他解析上下文
+                        _help_option.action = help_send(self.alconna.name, _get_help)
+                        analyse_option(self, _help_option)
                         return self.create_arpamar(fail=True)
-                    opt_n, opt_v = analyse_option(self, _param)
+                    if (opt := analyse_option(self, _param)).__class__ is ParseFailure:
+                        return self.mismatch(opt)  # type: ignore
+                    opt_n, opt_v = opt
                     if not self.options.get(opt_n, None):
                         self.options[opt_n] = opt_v
                     elif isinstance(self.options[opt_n], dict):
@@ -94,22 +96,34 @@ class DisorderCommandAnalyser(Analyser):
                         self.options[opt_n].append(opt_v)
 
                 elif isinstance(_param, Subcommand):
-                    sub_n, sub_v = analyse_subcommand(self, _param)
+                    if (sub := analyse_subcommand(self, _param)).__class__ is ParseFailure:
+                        return self.mismatch(sub)  # type: ignore
+                    sub_n, sub_v = sub
                     self.subcommands[sub_n] = sub_v
 
-            except (ParamsUnmatched, ArgumentMissing):
+            except (ParamsUnmatched, ArgumentMissing) as e:  # 类型转换时仍可能抛出
+                if timeout := self.timeout():
+                    return self.exceed(timeout)
                 if self.is_raise_exception:
                     raise
-                return self.create_arpamar(fail=True)
+                return self.create_arpamar(fail=True, exception=e)
+            except ExceedParseBudget as e:
+                return self.exceed(e)
             if self.current_index == self.ndata:
                 break
 
         # 防止主参数的默认值被忽略
         if self.default_main_only and not self.main_args:
-            self.main_args = analyse_args(
-                self, self.self_args,
-                self.separator, self.alconna.nargs, self.alconna.action
-            )
+            try:
+                main_args = analyse_args(
+                    self, self.self_args,
+                    self.separator, self.alconna.nargs, self.alconna.action
+                )
+            except ExceedParseBudget as e:
+                return self.exceed(e)
+            if main_args.__class__ is ParseFailure:
+                raise main_args.to_exception()  # type: ignore
+            self.main_args = main_args  # type: ignore
 
         if self.current_index == self.ndata and (not self.need_main_args or (self.need_main_args and self.main_args)):
             return self.create_arpamar()
@@ -119,6 +133,7 @@ class DisorderCommandAnalyser(Analyser):
             exc = ParamsUnmatched("Unmatched params: {}".format(self.next_data(self.separator, pop=False)[0]))
         else:
             exc = ArgumentMissing("You need more data to analyse!")
+        exc = self.timeout() or exc
         if self.is_raise_exception:
             raise exc
         return self.create_arpamar(fail=True, exception=exc)
@@ -127,10 +142,7 @@ class DisorderCommandAnalyser(Analyser):
         result = Arpamar()
         result.head_matched = self.head_matched
         if fail:
-            tb = traceback.format_exc(limit=1)
-            result.error_info = repr(exception) or repr(tb)
-            result.error_data = self.recover_raw_data()
-            result.matched = False
+            result.fail(exception, (self.current_index, self.content_index), self.detach().recover_raw_data)
         else:
             result.matched = True
             result.encapsulate_result(self.header, self.main_args, self.options, self.subcommands)
@@ -145,3 +157,40 @@ DisorderCommandAnalyser.add_arg_handler(ArgPattern, common_arg_handler)
 DisorderCommandAnalyser.add_arg_handler(ObjectPattern, common_arg_handler)
 DisorderCommandAnalyser.add_arg_handler(SequenceArg, common_arg_handler)
 DisorderCommandAnalyser.add_arg_handler(MappingArg, common_arg_handler)
+
+
+class CompiledCommandAnalyser(DisorderCommandAnalyser):
+    """
+    带有代码生成后端的无序分析器
+
+    构造时为命令生成专用的解析函数 (结构属于正则语言的命令优先使用单个正则), 纯文本消息先交由其处理;
+    生成的函数只负责解析成功的情况, 命令含有不支持的特性或是消息未能成功解析时, 均回退到 DisorderCommandAnalyser 的通用流程
+    """
+    fast_parse: Optional[FastParser]
+
+    def __init__(self, alconna):
+        super().__init__(alconna)
+        self.fast_parse = compile_regex(self) or compile_parser(self)
+
+    def fast_result(self, data: Union[str, DataCollection]) -> Optional[Arpamar]:
+        """以生成的解析函数处理纯文本消息, 未能成功解析时返回 None"""
+        if self.fast_parse and data.__class__ is str and not command_manager.is_disable(self.alconna):
+            try:
+                parsed = self.fast_parse(data)  # type: ignore
+            except Exception:  # 转换时抛出的异常交由通用流程处理
+                parsed = None
+            if parsed:
+                result = Arpamar()
+                result.head_matched = True
+                result.matched = True
+                result.encapsulate_result(parsed[0], parsed[1], parsed[2], {})
+                return result
+        return None
+
+    def handle_message(self, data: Union[str, DataCollection]) -> Optional[Arpamar]:
+        return self.fast_result(data) or super().feed(self.tokenize(data))
+
+    def feed(self, stream: Union[TokenStream, Sequence[Union[str, Any]]]) -> Optional[Arpamar]:
+        if stream.__class__ is TokenStream and (result := self.fast_result(stream.origin)):  # type: ignore
+            return result
+        return super().feed(stream)
@@ -10,6 +10,7 @@ from typing import Dict, Any, Optional, Callable, Union, TypeVar, List, Type, Fr
 from arclet.alconna.types import DataCollection
 from arclet.alconna.builtin.actions import store_value
 from arclet.alconna.main import Alconna
+from arclet.alconna.arpamar import Arpamar
 from arclet.alconna.component import Option, Subcommand
 from arclet.alconna.base import Args, TAValue, ArgAction
 from arclet.alconna.util import split, split_once
@@ -70,17 +71,19 @@ class ALCCommand:
     def __call__(self, message: Union[str, DataCollection]) -> Any:
         if not self.exec_target:
             raise Exception("This must behind a @xxx.command()")
-        result = self.command.parse(message)
+        self.__exec(self.command.parse(message))
+
+    def __exec(self, result: Arpamar):
         if result.matched:
             self.parser_func(self.exec_target, result.all_matched_args, self.local_args, self.loop)
 
     def from_commandline(self):
-        """从命令行解析参数"""
+        """从命令行解析参数, 各参数直接作为 token 传入, 不再拼接后切分"""
         if not self.command:
             raise Exception("You must call @xxx.command() before @xxx.from_commandline()")
-        args = sys.argv[1:]
-        args.insert(0, self.command.command)
-        self.__call__(" ".join(args))
+        if not self.exec_target:
+            raise Exception("This must behind a @xxx.command()")
+        self.__exec(self.command.parse_tokens([self.command.command, *sys.argv[1:]]))
 
 
 F = TypeVar("F", bound=Callable[..., Any])
@@ -1,6 +1,7 @@
 """Alconna 的组件相关"""
 from typing import Union, Dict, List, Any, Optional, Callable, Iterable
 from .base import CommandNode, Args, ArgAction
+from .util import PrefixTrie
 
 
 class Option(CommandNode):
@@ -50,6 +51,7 @@ class Subcommand(CommandNode):
     """子命令, 次于主命令, 可解析 SubOption"""
     options: List[Option]
     sub_params: Dict[str, Union[Args, Option]]
+    sub_trie: PrefixTrie
     sub_part_len: range
 
     def __init__(
@@ -64,6 +66,7 @@ class Subcommand(CommandNode):
         self.options = list(options or [])
         super().__init__(name, args, action, separator, help_text)
         self.sub_params = {}
+        self.sub_trie = PrefixTrie()
         self.sub_part_len = range(self.nargs)
 
     def to_dict(self) -> Dict[str, Any]:
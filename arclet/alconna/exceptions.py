@@ -29,6 +29,10 @@ class ExceedMaxCount(Exception):
     """注册的命令数量超过最大长度"""
 
 
+class ExceedParseBudget(Exception):
+    """单次解析超出了允许的步数或时间"""
+
+
 class CancelBehave(Exception):
     """行为执行被停止"""
 
@@ -1,5 +1,5 @@
-from typing import Union, Optional, Dict, Any
-import traceback
+from typing import Union, Optional, Dict, Any, List, Tuple
+from copy import copy
 
 from arclet.alconna.component import Option, Subcommand
 from arclet.alconna.arpamar import Arpamar
@@ -7,14 +7,16 @@ from arclet.alconna.types import (
     MultiArg, ArgPattern, AntiArg, UnionArg, ObjectPattern, SequenceArg, MappingArg
 )
 from arclet.alconna.visitor import AlconnaNodeVisitor
-from arclet.alconna.analysis.analyser import Analyser
+from arclet.alconna.analysis.analyser import Analyser, ParseFailure, UNIT_TEXT, UNIT_ELEMENT, UNIT_FILTERED
 from arclet.alconna.manager import command_manager
 from arclet.alconna.analysis.arg_handlers import (
     multi_arg_handler, common_arg_handler, anti_arg_handler, union_arg_handler
 )
 from arclet.alconna.analysis.parts import analyse_args, analyse_option, analyse_subcommand, analyse_header
-from arclet.alconna.exceptions import ParamsUnmatched, ArgumentMissing, NullTextMessage, UnexpectedElement
-from arclet.alconna.util import split
+from arclet.alconna.exceptions import (
+    ParamsUnmatched, ArgumentMissing, ExceedParseBudget
+)
+from arclet.alconna.analysis.tokens import TextSegment, TokenStream
 from arclet.alconna.builtin.actions import help_send
 
 from graia.ariadne.message.chain import MessageChain
@@ -36,50 +38,72 @@ class GraiaCommandAnalyser(Analyser):
             for sub_opts in opt.options:
                 opt.sub_params.setdefault(sub_opts.name, sub_opts)
         self.params[opt.name] = opt
+        self.build_tries()
+
+    @classmethod
+    def classify_unit(cls, unit: Any) -> int:
+        if isinstance(unit, Plain):
+            kind = UNIT_TEXT
+        elif unit.type in cls.filter_set:
+            kind = UNIT_FILTERED
+        else:
+            kind = UNIT_ELEMENT
+        cls.unit_kinds[unit.__class__] = kind
+        return kind
 
-    def handle_message(self, data: MessageChain) -> Optional[Arpamar]:
-        """命令分析功能, 传入字符串或消息链, 应当在失败时返回fail的arpamar"""
+    def tokenize(self, data: MessageChain) -> TokenStream:
+        """将消息链切分为 TokenStream, 不修改解析状态"""
         separate = self.separator
         i, __t, exc = 0, False, None
         raw_data: Dict[int, Any] = {}
+        kinds = self.unit_kinds
         for unit in data:
+            if (kind := kinds.get(unit.__class__)) is None:
+                kind = self.classify_unit(unit)
             # using graia.amnesia.message and graia.amnesia.elements
             # if isinstance(unit, Text):
-            #     res = split(unit.text.lstrip(' '), separate)
-            #     if not res:
+            #     res = TextSegment(unit.text.lstrip(' '), separate)
+            #     if not res.has(0):
             #         continue
             #     raw_data[i] = res
             #     __t = True
             # elif isinstance(unit, Unknown):
-            #     if self.is_raise_exception:
-            #         exc = UnexpectedElement(f"{unit.type}({unit})")
+            #     exc = unit
             #     continue
             # elif unit.__class__.__name__ not in self.filter_out:
             #     raw_data[i] = unit
-            if isinstance(unit, Plain):
-                res = split(unit.text.lstrip(' '), separate)
-                if not res:
+            if kind == UNIT_TEXT:
+                res = TextSegment(unit.text.lstrip(' '), separate)
+                if not res.has(0):
                     continue
                 raw_data[i] = res
                 __t = True
-            elif unit.type not in self.filter_out:
+            elif kind == UNIT_ELEMENT:
                 raw_data[i] = unit
             else:
-                if self.is_raise_exception:
-                    exc = UnexpectedElement(f"{unit.type}({unit})")
+                exc = unit
                 continue
             i += 1
 
-        if __t is False:
-            if self.is_raise_exception:
-                raise NullTextMessage("传入了一个无法获取文本的消息链")
-            return self.create_arpamar(fail=True, exception=NullTextMessage("传入了一个无法获取文本的消息链"))
-        if exc:
-            if self.is_raise_exception:
-                raise exc
-            return self.create_arpamar(fail=True, exception=exc)
-        self.raw_data = raw_data
-        self.ndata = i
+        return TokenStream(data, self.token_key, raw_data, False, null=__t is False, unexpected=exc)
+
+    def head_data(self, data: MessageChain, count: int) -> List[Tuple[Union[str, Any], bool]]:
+        """按 handle_message 的方式取出消息链开头的至多 count 个数据, 不修改解析状态"""
+        result: List[Tuple[Union[str, Any], bool]] = []
+        kinds = self.unit_kinds
+        for unit in data:
+            if (kind := kinds.get(unit.__class__)) is None:
+                kind = self.classify_unit(unit)
+            if kind == UNIT_TEXT:
+                segment, index = TextSegment(unit.text.lstrip(' '), self.separator), 0
+                while len(result) < count and segment.has(index):
+                    result.append((segment.get(index), True))
+                    index += 1
+            elif kind == UNIT_ELEMENT:
+                result.append((unit, False))
+            if len(result) == count:
+                break
+        return result
 
     def analyse(self, message: Union[MessageChain, None] = None) -> Arpamar:
         if command_manager.is_disable(self.alconna):
@@ -89,9 +113,7 @@ class GraiaCommandAnalyser(Analyser):
                 raise ValueError('No data to analyse')
             if r := self.handle_message(message):
                 return r
-        try:
-            self.header = analyse_header(self)
-        except ParamsUnmatched as e:
+        if (header := analyse_header(self)).__class__ is ParseFailure:
             self.current_index = 0
             self.content_index = 0
             try:
@@ -106,22 +128,21 @@ class GraiaCommandAnalyser(Analyser):
                 self.reset()
                 return self.analyse(MessageChain.create(cmd))
             except ValueError:
-                return self.create_arpamar(fail=True, exception=e)
+                return self.create_arpamar(fail=True, exception=header.to_exception())  # type: ignore
+        self.header = header  # type: ignore
 
         for _ in self.part_len:
             _text, _str = self.next_data(self.separator, pop=False)
-            _param = self.params.get(_text, None) if _str else Ellipsis
-            if not _param and _text != "":
-                for p in self.params:
-                    if _text.startswith(getattr(self.params[p], 'alias', p)):
-                        _param = self.params[p]
-                        break
+            _param = self.params_trie.longest(_text)[0] if _str else Ellipsis
             try:
                 if not _param or _param is Ellipsis:
                     if not self.main_args:
-                        self.main_args = analyse_args(
+                        main_args = analyse_args(
                             self, self.self_args, self.separator, self.alconna.nargs, self.alconna.action
                         )
+                        if main_args.__class__ is ParseFailure:
+                            return self.mismatch(main_args)  # type: ignore
+                        self.main_args = main_args  # type: ignore
                 elif isinstance(_param, Option):
                     if _param.name == "--help":
                         def _get_help():
@@ -131,12 +152,13 @@ class GraiaCommandAnalyser(Analyser):
                                 visitor.require(self.recover_raw_data())
                             )
 
-                        _param.action = help_send(
-                            self.alconna.name, _get_help
-                        )
-                        analyse_option(self, _param)
+                        _help_option = copy(_param)  # 不修改共享的 Option, 以免影响其他解析上下文
+                        _help_option.action = help_send(self.alconna.name, _get_help)
+                        analyse_option(self, _help_option)
                         return self.create_arpamar(fail=True)
-                    opt_n, opt_v = analyse_option(self, _param)
+                    if (opt := analyse_option(self, _param)).__class__ is ParseFailure:
+                        return self.mismatch(opt)  # type: ignore
+                    opt_n, opt_v = opt
                     if not self.options.get(opt_n, None):
                         self.options[opt_n] = opt_v
                     elif isinstance(self.options[opt_n], dict):
@@ -145,22 +167,32 @@ class GraiaCommandAnalyser(Analyser):
                         self.options[opt_n].append(opt_v)
 
                 elif isinstance(_param, Subcommand):
-                    sub_n, sub_v = analyse_subcommand(self, _param)
+                    if (sub := analyse_subcommand(self, _param)).__class__ is ParseFailure:
+                        return self.mismatch(sub)  # type: ignore
+                    sub_n, sub_v = sub
                     self.subcommands[sub_n] = sub_v
 
-            except (ParamsUnmatched, ArgumentMissing):
+            except (ParamsUnmatched, ArgumentMissing) as e:  # 类型转换时仍可能抛出
                 if self.is_raise_exception:
                     raise
-                return self.create_arpamar(fail=True)
+                return self.create_arpamar(fail=True, exception=e)
+            except ExceedParseBudget as e:
+                return self.exceed(e)
             if self.current_index == self.ndata:
                 break
 
         # 防止主参数的默认值被忽略
         if self.default_main_only and not self.main_args:
-            self.main_args = analyse_args(
-                self, self.self_args,
-                self.separator, self.alconna.nargs, self.alconna.action
-            )
+            try:
+                main_args = analyse_args(
+                    self, self.self_args,
+                    self.separator, self.alconna.nargs, self.alconna.action
+                )
+            except ExceedParseBudget as e:
+                return self.exceed(e)
+            if main_args.__class__ is ParseFailure:
+                raise main_args.to_exception()  # type: ignore
+            self.main_args = main_args  # type: ignore
 
         if self.current_index == self.ndata and (not self.need_main_args or (self.need_main_args and self.main_args)):
             return self.create_arpamar()
@@ -178,10 +210,7 @@ class GraiaCommandAnalyser(Analyser):
         result = Arpamar()
         result.head_matched = self.head_matched
         if fail:
-            tb = traceback.format_exc(limit=1)
-            result.error_info = repr(exception) or repr(tb)
-            result.error_data = self.recover_raw_data()
-            result.matched = False
+            result.fail(exception, (self.current_index, self.content_index), self.detach().recover_raw_data)
         else:
             result.matched = True
             result.encapsulate_result(self.header, self.main_args, self.options, self.subcommands)
@@ -135,6 +135,7 @@ class GraiaAMP(AlconnaMessageProxy):
             return GraiaAlconnaPropetry(origin, result, help_text, source)
 
         self.pre_treatments.setdefault(command, pre_treatment or reply_help_message)  # type: ignore
+        self.prefilter.add(command)  # type: ignore
 
     async def fetch_message(self) -> AsyncIterator[Tuple[MessageChain, MessageEvent]]:
         pass
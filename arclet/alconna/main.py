@@ -1,7 +1,8 @@
 """Alconna 主体"""
-from typing import Dict, List, Optional, Union, Type, Callable, Any, Tuple
+from typing import Dict, List, Optional, Union, Type, Callable, Any, Tuple, Sequence
 from .analysis.analyser import Analyser
 from .analysis import compile
+from .analysis.tokens import TokenStream
 from .base import CommandNode, Args, ArgAction
 from .component import Option, Subcommand
 from .arpamar import Arpamar, ArpamarBehavior
@@ -57,6 +58,8 @@ class Alconna(CommandNode):
     __cls_name__: str = "Alconna"
     local_args: dict = {}
     formatter: AbstractHelpTextFormatter
+    max_steps: Optional[int]
+    max_time: Optional[float]
     default_analyser: Type[Analyser] = DisorderCommandAnalyser  # type: ignore
 
     def __init__(
@@ -73,6 +76,8 @@ class Alconna(CommandNode):
             analyser_type: Optional[Type[Analyser]] = None,
             behaviors: Optional[List[ArpamarBehavior]] = None,
             formatter: Optional[AbstractHelpTextFormatter] = None,
+            max_steps: Optional[int] = None,
+            max_time: Optional[float] = None,
     ):
         """
         以标准形式构造 Alconna
@@ -88,6 +93,8 @@ class Alconna(CommandNode):
             separator: 命令参数分隔符，默认为空格
             help_text: 帮助文档，默认为 'Unknown Information'
             analyser_type: 命令解析器类型，默认为 DisorderCommandAnalyser
+            max_steps: 单次解析最多读取数据的次数，超出时解析失败，默认不限制
+            max_time: 单次解析最长的耗时 (秒)，超出时解析失败，默认不限制
         """
         # headers与command二者必须有其一
         if all((not headers, not command)):
@@ -103,6 +110,8 @@ class Alconna(CommandNode):
             help_text or "Unknown Information"
         )
         self.is_raise_exception = is_raise_exception
+        self.max_steps = max_steps
+        self.max_time = max_time
         self.namespace = namespace or self.__cls_name__
         self.options.append(Option("--help", alias="-h"))
         self.analyser_type = analyser_type or self.default_analyser
@@ -170,15 +179,41 @@ class Alconna(CommandNode):
         self.__check_action__(action)
         return self
 
-    def parse(self, message: Union[str, DataCollection], static: bool = True) -> Arpamar:
-        """命令分析功能, 传入字符串或消息链, 返回一个特定的数据集合类"""
+    def parse(self, message: Union[str, DataCollection, TokenStream], static: bool = True) -> Arpamar:
+        """
+        命令分析功能, 传入字符串或消息链, 返回一个特定的数据集合类
+
+        也可传入 Analyser.tokenize 得到的 TokenStream, 切分方式相同时直接复用其中的数据
+        """
         if static:
-            analyser = command_manager.require(self)
+            analyser = command_manager.require(self).fork()
         else:
             analyser = compile(self)
-        result = analyser.handle_message(message)
+        if message.__class__ is TokenStream:
+            result = analyser.feed(message)  # type: ignore
+        else:
+            result = analyser.handle_message(message)
         return (result or analyser.analyse()).update(self.behaviors)
 
+    def parse_tokens(self, tokens: Sequence[Union[str, DataUnit]], static: bool = True) -> Arpamar:
+        """
+        命令分析功能, 传入已切分好的 token 与消息元素, 返回一个特定的数据集合类
+
+        字符串 token 原样使用, 不会经过字符串的拼接与再次切分
+        """
+        return self.parse(command_manager.require(self).tokenize_tokens(tokens), static)
+
+    def matches_head(self, message: Union[str, DataCollection]) -> Any:
+        """
+        只判断消息是否以本命令的命令头开头, 不进行完整的解析
+
+        Returns:
+            命令名中有捕获组时为捕获结果, 否则为 True; 不匹配或命令被禁用时返回 None
+        """
+        if command_manager.is_disable(self):
+            return None
+        return command_manager.require(self).probe_header(message)
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
@@ -1,15 +1,279 @@
 """Alconna 负责记录命令的部分"""
 
 import re
-from typing import TYPE_CHECKING, Dict, Optional, Union, List, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Union, List, Tuple, Any, Pattern
 from .exceptions import DuplicateCommand, ExceedMaxCount
 from .analysis import compile as compile_analysis
-from .util import Singleton
+from .util import Singleton, literal_prefix
 from .types import DataCollection
 
 if TYPE_CHECKING:
     from .main import Alconna
     from .analysis.analyser import Analyser
+    from .analysis.tokens import TokenStream
+    from .arpamar import Arpamar
+
+
+_regex_chars = frozenset(".^$*+?{}[]\\|()")
+_normalised = frozenset("'\"\\\n\r")
+_regex_unmergeable = re.compile(r"\\\d|\(\?P[<=]")  # 含命名组或反向引用的正则无法合并
+
+
+class _DispatchIndex:
+    """
+    单个命名空间内用于广播的命令索引
+
+    字面量的命令名 (以及 命令头 + 命令名) 存放于前缀树中, 含有正则的命令名则合并为一个预编译的分支正则;
+    含命名组或反向引用的正则, 以及合并后无法编译时的全部正则, 则各自单独编译并逐个匹配;
+    每个命令记录其注册顺序, 多个命令同时匹配时取最先注册的一个
+    """
+
+    def __init__(self):
+        self.trie: Dict[str, Any] = {}
+        self.literals: Dict[str, List[str]] = {}
+        self.regexes: Dict[str, str] = {}
+        self.orders: Dict[str, int] = {}
+        self.count = 0
+        self._pattern: Optional[Pattern] = None
+        self._groups: Dict[str, str] = {}
+        self._singles: List[Tuple[str, Pattern]] = []
+        self._compiled = False
+
+    @staticmethod
+    def command_keys(command: "Alconna") -> Tuple[List[str], List[str]]:
+        """获取命令可能的起始文本, 分为字面量与正则两类"""
+        cid = command.name.replace(CommandManager.sign, "")
+        literals, regexes = [], []
+        (regexes if _regex_chars.intersection(cid) else literals).append(cid)
+        if command.headers != [""] and command.command:
+            is_regex = bool(_regex_chars.intersection(command.command))
+            for header in command.headers:
+                if not isinstance(header, str):
+                    continue
+                if is_regex:
+                    regexes.append(re.escape(header) + command.command)
+                else:
+                    literals.append(header + command.command)
+        return literals, regexes
+
+    def add(self, cid: str, command: "Alconna"):
+        literals, regexes = self.command_keys(command)
+        self.orders[cid] = self.count
+        self.count += 1
+        self.literals[cid] = literals
+        for key in literals:
+            node = self.trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node.setdefault("", []).append(cid)
+        if regexes:
+            self.regexes[cid] = "|".join(f"(?:{r})" for r in regexes)
+            self._compiled = False
+
+    def remove(self, cid: str):
+        self.orders.pop(cid, None)
+        for key in self.literals.pop(cid, []):
+            path = [self.trie]
+            for char in key:
+                path.append(path[-1][char])
+            path[-1][""].remove(cid)
+            if not path[-1][""]:
+                del path[-1][""]
+            for i in range(len(key) - 1, -1, -1):  # 清理空的分支
+                if path[i + 1]:
+                    break
+                del path[i][key[i]]
+        if self.regexes.pop(cid, None) is not None:
+            self._compiled = False
+
+    def _compile(self):
+        """将可合并的正则编译为一个分支正则, 其余正则单独编译"""
+        merged: Dict[str, str] = {}
+        self._singles = []
+        for cid, regex in self.regexes.items():
+            if _regex_unmergeable.search(regex):
+                self._add_single(cid, regex)
+            else:
+                merged[cid] = regex
+        self._groups = {f"_{i}": cid for i, cid in enumerate(merged)}
+        self._pattern = None
+        if merged:
+            try:
+                self._pattern = re.compile("|".join(f"(?P<_{i}>{r})" for i, r in enumerate(merged.values())))
+            except re.error:
+                for cid, regex in merged.items():
+                    self._add_single(cid, regex)
+        self._compiled = True
+
+    def _add_single(self, cid: str, regex: str):
+        try:
+            self._singles.append((cid, re.compile(regex)))
+        except re.error:
+            pass
+
+    def find(self, command: str) -> Optional[str]:
+        """查找起始文本与 command 匹配的命令, 返回其 id"""
+        result: Optional[str] = None
+        node = self.trie
+        for char in command:
+            if not (node := node.get(char)):
+                break
+            for cid in node.get("", ()):
+                if result is None or self.orders[cid] < self.orders[result]:
+                    result = cid
+        if self.regexes:
+            if not self._compiled:
+                self._compile()
+            if (
+                self._pattern and (matched := self._pattern.match(command)) and
+                (cid := self._groups[matched.lastgroup])  # type: ignore
+            ):
+                if result is None or self.orders[cid] < self.orders[result]:
+                    result = cid
+            for cid, pattern in self._singles:
+                if (result is None or self.orders[cid] < self.orders[result]) and pattern.match(command):
+                    result = cid
+        return result
+
+
+class MessagePrefilter:
+    """
+    消息预过滤器
+
+    由各命令的 命令头 + 命令名 的字面量前缀与快捷命令构建, 只查看消息开头的若干字符,
+    在分词之前排除不可能匹配任何命令的消息; 命令名以正则开头而无法确定前缀时, 所有文本消息都会通过
+
+    Attributes:
+        hit: 通过过滤的消息数
+        miss: 被过滤掉的消息数
+    """
+    hit: int
+    miss: int
+
+    def __init__(self, keys: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            keys: 快捷命令的前缀树, 传入时与其他过滤器共享同一棵前缀树
+        """
+        self.commands: Dict["Alconna", None] = {}
+        self.keys = {} if keys is None else keys
+        self.hit = 0
+        self.miss = 0
+        self._trie: Optional[Dict[str, Any]] = None
+        self._elements = False
+        self._filter_out: frozenset = frozenset()
+        self._blanks = " "
+
+    @staticmethod
+    def command_prefixes(command: "Alconna") -> Tuple[List[str], bool]:
+        """获取命令的文本前缀, 以及命令是否可能以元素开头"""
+        command_prefix = literal_prefix(command.command)
+        if command.headers == [""]:
+            return [command_prefix], False
+        prefixes, element = [], False
+        with_element = any(not isinstance(h, str) for h in command.headers)
+        for header in command.headers:
+            if isinstance(header, str):
+                # 与元素混用时, 文本命令头与命令名分属两个 token
+                prefixes.append(header if with_element else header + command_prefix)
+            else:
+                element = True
+        return prefixes, element
+
+    def add(self, command: "Alconna"):
+        self.commands[command] = None
+        self._trie = None
+
+    def remove(self, command: "Alconna"):
+        if self.commands.pop(command, ...) is None:
+            self._trie = None
+
+    def add_key(self, key: str):
+        """添加快捷命令"""
+        node = self.keys
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def _build(self):
+        trie: Dict[str, Any] = {}
+        filter_out, blanks = set(), {" "}
+        self._elements = False
+        for command in self.commands:
+            prefixes, element = self.command_prefixes(command)
+            self._elements |= element
+            filter_out.update(command.analyser_type.filter_out)
+            blanks.update(command.separator)
+            for prefix in prefixes:
+                node = trie
+                for char in prefix:
+                    node = node.setdefault(char, {})
+                node[""] = True
+        self._filter_out = frozenset(filter_out)
+        self._blanks = "".join(blanks)
+        self._trie = trie
+
+    @staticmethod
+    def _walk(node: Dict[str, Any], text: str) -> bool:
+        if "" in node:
+            return True
+        for char in text:
+            if (node := node.get(char)) is None:  # type: ignore
+                return False
+            if "" in node:
+                return True
+        return False
+
+    def _match_text(self, text: str) -> bool:
+        if not text:
+            return False
+        for char in text:  # 首个 token 中的引号、转义符与换行符会在分词时被处理, 此时无法只凭原文判断
+            if char in self._blanks:
+                break
+            if char in _normalised:
+                return True
+        if self._walk(self._trie, text) or self._walk(self.keys, text):  # type: ignore
+            return True
+        if (stripped := text.lstrip(self._blanks)) != text:  # 开头的分隔符会在分词时被跳过
+            return self._match_text(stripped)
+        return False
+
+    def _match(self, message: Union[str, DataCollection]) -> bool:
+        if self._trie is None:
+            self._build()
+        if isinstance(message, str):
+            return self._match_text(message.lstrip())
+        for unit in message:
+            if isinstance(text := getattr(unit, 'text', None) or unit, str):
+                if not (text := text.lstrip(' ')).strip(self._blanks):
+                    continue
+                return self._match_text(text)
+            if unit.__class__.__name__ not in self._filter_out:
+                return self._elements
+        return False
+
+    def __call__(self, message: Union[str, DataCollection]) -> bool:
+        """判断消息是否可能匹配某个命令"""
+        if self._match(message):
+            self.hit += 1
+            return True
+        self.miss += 1
+        return False
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """过滤器的命中情况"""
+        total = self.hit + self.miss
+        return {
+            "hit": self.hit,
+            "miss": self.miss,
+            "hit_rate": self.hit / total if total else 0.0,
+            "miss_rate": self.miss / total if total else 0.0,
+        }
+
+    def reset_stats(self):
+        self.hit = 0
+        self.miss = 0
 
 
 class CommandManager(metaclass=Singleton):
@@ -20,18 +284,23 @@ class CommandManager(metaclass=Singleton):
     default_namespace: str = "Alconna"
     __shortcuts: Dict[str, Tuple[str, str, bool]] = {}
     __commands: Dict[str, Dict[str, "Analyser"]]
+    __indexes: Dict[str, _DispatchIndex]
     __abandons: List["Alconna"]
+    prefilter: MessagePrefilter
     current_count: int
     max_count: int = 100
 
     def __init__(self):
 
         self.__commands = {}
+        self.__indexes = {}
         self.__abandons = []
+        self.prefilter = MessagePrefilter()
         self.current_count = 0
 
     def __del__(self):  # td: save to file
         self.__commands = {}
+        self.__indexes = {}
         self.__abandons = []
 
     @property
@@ -51,9 +320,12 @@ class CommandManager(metaclass=Singleton):
             raise ExceedMaxCount
         if command.namespace not in self.__commands:
             self.__commands[command.namespace] = {}
+            self.__indexes[command.namespace] = _DispatchIndex()
         cid = command.name.replace(self.sign, "")
         if cid not in self.__commands[command.namespace]:
             self.__commands[command.namespace][cid] = compile_analysis(command)
+            self.__indexes[command.namespace].add(cid, command)
+            self.prefilter.add(command)
             self.current_count += 1
         else:
             raise DuplicateCommand("命令已存在")
@@ -76,19 +348,17 @@ class CommandManager(metaclass=Singleton):
         """删除命令"""
         if isinstance(command, str):
             namespace, name = self._command_part(command)
-            try:
-                del self.__commands[namespace][name]
-            finally:
-                if self.__commands[namespace] == {}:
-                    del self.__commands[namespace]
-                return None
-        cid = command.name.replace(self.sign, "")
-        namespace = command.namespace
+        else:
+            namespace, name = command.namespace, command.name.replace(self.sign, "")
         try:
-            del self.__commands[namespace][cid]
+            self.prefilter.remove(self.__commands[namespace][name].alconna)
+            del self.__commands[namespace][name]
+            self.__indexes[namespace].remove(name)
+            self.current_count -= 1
         finally:
             if self.__commands[namespace] == {}:
                 del self.__commands[namespace]
+                del self.__indexes[namespace]
             return None
 
     def is_disable(self, command: "Alconna") -> bool:
@@ -118,6 +388,7 @@ class CommandManager(metaclass=Singleton):
         if shortcut in self.__shortcuts:
             raise DuplicateCommand("快捷命令已存在")
         self.__shortcuts[shortcut] = (target.namespace + "." + target.name.replace(self.sign, ""), command, reserve)
+        self.prefilter.add_key(shortcut)
 
     def find_shortcut(self, target: Union["Alconna", str], shortcut: str):
         """查找快捷命令"""
@@ -165,24 +436,68 @@ class CommandManager(metaclass=Singleton):
             return []
         return [alc.alconna for alc in self.__commands[namespace].values()]
 
-    def broadcast(self, command: Union[str, DataCollection], namespace: Optional[str] = None):
-        """广播命令"""
+    def broadcast(self, command: Union[str, DataCollection], namespace: Optional[str] = None, multi: bool = False):
+        """
+        广播命令
+
+        Args:
+            command: 待广播的消息
+            namespace: 指定的命名空间, 为 None 时遍历所有命名空间
+            multi: 是否返回所有匹配的命令的解析结果; 此时消息对切分方式相同的命令只切分一次
+        """
         command = str(command)
+        if not self.prefilter(command):
+            return [] if multi else None
+        if multi:
+            return self._broadcast_all(command, namespace)
         may_command_head = command.split(" ")[0]
-        if namespace is None:
-            for n in self.__commands:
-                if self.__commands[n].get(may_command_head):
-                    return self.__commands[n][may_command_head].analyse(command)
-                for k in self.__commands[n]:
-                    if re.match("^" + k + ".*" + "$", command):
-                        return self.__commands[n][k].analyse(command)
-        else:
-            commands = self.__commands[namespace]
+        for n in ([namespace] if namespace is not None else list(self.__commands)):
+            commands = self.__commands[n]
             if commands.get(may_command_head):
-                return self.__commands[namespace][may_command_head].analyse(command)
-            for k in self.__commands[namespace]:
-                if re.match("^" + k + ".*" + "$", command):
-                    return self.__commands[namespace][k].analyse(command)
+                return commands[may_command_head].fork().analyse(command)
+            if cid := self.__indexes[n].find(command):
+                return commands[cid].fork().analyse(command)
+
+    def _broadcast_all(self, command: Union[str, DataCollection], namespace: Optional[str] = None) -> List["Arpamar"]:
+        """以共享的 TokenStream 解析所有命令头匹配的命令, 按注册顺序返回匹配成功的结果"""
+        streams: Dict[Tuple[type, str], "TokenStream"] = {}
+        results = []
+        for n in ([namespace] if namespace is not None else list(self.__commands)):
+            for analyser in self.__commands.get(n, {}).values():
+                if self.is_disable(analyser.alconna):
+                    continue
+                stream = analyser.tokenize_shared(command, streams)
+                if stream.null or analyser.command_header.match(stream.head(2)) is None:
+                    continue
+                analyser = analyser.fork()
+                result = analyser.feed(stream) or analyser.analyse()
+                if result.matched:
+                    results.append(result)
+        return results
+
+    def matches_head(
+            self, message: Union[str, DataCollection], namespace: Optional[str] = None
+    ) -> Optional[Tuple["Alconna", Any]]:
+        """
+        只匹配命令头, 找出消息对应的命令
+
+        消息开头的数据对分隔符与分析器类型相同的命令只切分一次
+
+        Returns:
+            第一个命令头匹配的命令与匹配结果, 均不匹配时返回 None
+        """
+        if not self.prefilter(message):
+            return None
+        heads: Dict[Tuple[type, str], List[Tuple[Any, bool]]] = {}
+        for n in ([namespace] if namespace is not None else list(self.__commands)):
+            for analyser in self.__commands.get(n, {}).values():
+                if self.is_disable(analyser.alconna):
+                    continue
+                if (data := heads.get(key := (analyser.__class__, analyser.separator))) is None:
+                    data = heads[key] = analyser.head_data(message, 2)
+                if (result := analyser.command_header.match(data)) is not None:
+                    return analyser.alconna, result
+        return None
 
     def all_command_help(
             self,
@@ -7,7 +7,8 @@ from typing import Optional, Union, Callable, Dict, AsyncIterator, Coroutine, An
 from .types import DataCollection
 from .main import Alconna
 from .arpamar import Arpamar
-from .manager import command_manager
+from .analysis.tokens import TokenStream
+from .manager import command_manager, MessagePrefilter
 from .builtin.actions import require_help_send_action
 
 
@@ -42,11 +43,13 @@ class AlconnaMessageProxy(metaclass=abc.ABCMeta):
     """消息解析的代理"""
     loop: asyncio.AbstractEventLoop
     export_results: Queue
+    prefilter: MessagePrefilter
     pre_treatments: Dict[Alconna, Callable[[Union[str, DataCollection], Arpamar, Optional[str]], AlconnaProperty]]
 
     def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
         self.loop = loop or asyncio.get_event_loop()
         self.pre_treatments = {}
+        self.prefilter = MessagePrefilter(command_manager.prefilter.keys)
         try:
             self.export_results = Queue(loop=self.loop)
         except TypeError:
@@ -66,6 +69,7 @@ class AlconnaMessageProxy(metaclass=abc.ABCMeta):
             if not command:
                 raise ValueError(f'Command {command} not found')
         self.pre_treatments.setdefault(command, pre_treatment or self.default_pre_treatment)  # type: ignore
+        self.prefilter.add(command)  # type: ignore
 
     @abc.abstractmethod
     async def fetch_message(self) -> AsyncIterator[Tuple[Union[str, DataCollection], Any]]:
@@ -94,14 +98,16 @@ class AlconnaMessageProxy(metaclass=abc.ABCMeta):
 
             require_help_send_action(_h, _command.name)
 
-            _res = _command.parse(message)
+            # 切分方式相同的命令共享同一次切分的结果
+            _res = _command.parse(command_manager.require(_command).tokenize_shared(message, streams))
             _property = await run_always_await(_treatment, message, _res, may_help_text, source)
             if not self.later_condition(_property):
                 return
             await self.export_results.put(_property)
+        streams: Dict[Tuple[type, str], TokenStream] = {}
         if command and command in self.pre_treatments:
             await __exec(command, self.pre_treatments[command])
-        else:
+        elif self.prefilter(message):  # 预过滤只用于广播给所有命令的情况
             for command, treatment in self.pre_treatments.items():
                 await __exec(command, treatment)
 
@@ -1,7 +1,8 @@
 """Alconna 参数相关"""
 import re
 import inspect
-from functools import lru_cache
+import warnings
+from array import array
 from collections.abc import (
     Iterable as ABCIterable,
     Sequence as ABCSequence,
@@ -15,7 +16,8 @@ from enum import Enum
 from typing import TypeVar, Type, Callable, Optional, Protocol, Any, Pattern, Union, Sequence, \
     List, Dict, get_args, Literal, Tuple, get_origin
 from types import LambdaType
-from .exceptions import ParamsUnmatched
+from .exceptions import ParamsUnmatched, InvalidParam
+from .util import BoundedCache, split_literal, unquote, parse_literal, whole_group, backtrack_risk
 
 DataUnit = TypeVar("DataUnit")
 
@@ -60,6 +62,33 @@ AnyParam = _AnyParam()
 AllParam = _AnyAllParam()
 Empty = inspect.Signature.empty
 
+_unconverted = object()  # 缓存条目中尚未执行转换的标记
+_immutable_types = (str, int, float, bool, complex, bytes, frozenset, type(None), type(Ellipsis))
+
+
+converter_map: Dict[Any, Callable[[str], Any]] = {
+    int: int,
+    float: float,
+    bool: {"True": True, "true": True, "False": False, "false": False}.__getitem__,
+    list: parse_literal,
+    tuple: parse_literal,
+    set: parse_literal,
+    dict: parse_literal,
+}
+
+
+def add_converter(origin_type: Any, converter: Callable[[str], Any]):
+    """为 origin_type 注册转换方法, 此后以其为 origin_type 且未指定 transform_action 的 ArgPattern 会使用该方法"""
+    converter_map[origin_type] = converter
+    return converter
+
+
+def _is_immutable(value: Any) -> bool:
+    """判断转换结果能否在多次解析间共享"""
+    if value.__class__ is tuple:
+        return all(_is_immutable(v) for v in value)
+    return value.__class__ in _immutable_types
+
 
 class ArgPattern:
     """
@@ -69,9 +98,10 @@ class ArgPattern:
         re_pattern: 实际的正则表达式
         pattern: 用以正则解析的表达式
         token: 匹配类型
-        transform_action: 匹配成功后的转换方法
+        transform_action: 匹配成功后的转换方法, 未指定时从 converter_map 中按 origin_type 选取, 默认为 parse_literal
         origin_type: 针对action的类型检查
         alias: 别名, 用于类型检查与参数打印
+        cache: 匹配结果的缓存
     """
 
     re_pattern: Pattern
@@ -80,28 +110,56 @@ class ArgPattern:
     transform_action: Callable[[str], Any]
     origin_type: Type
     alias: Optional[str]
+    cache: BoundedCache
 
-    __slots__ = "re_pattern", "pattern", "token", "origin_type", "transform_action", "alias"
+    default_cache_size: int = 256
+    default_cache_policy: Literal["lru", "fifo"] = "lru"
+    backtrack_policy: Literal["warn", "reject", "ignore"] = "warn"  # 发现可能灾难性回溯的表达式时的处理方式
+
+    __slots__ = "re_pattern", "pattern", "token", "origin_type", "transform_action", "alias", "cache"
 
     def __init__(
             self,
             regex_pattern: str,
             token: PatternToken = PatternToken.REGEX_MATCH,
             origin_type: Type = str,
-            transform_action: Callable = lambda x: eval(x),
-            alias: Optional[str] = None
+            transform_action: Optional[Callable[[str], Any]] = None,
+            alias: Optional[str] = None,
+            cache_size: Optional[int] = None,
+            cache_policy: Optional[Literal["lru", "fifo"]] = None,
     ):
         self.pattern = regex_pattern
         self.re_pattern = re.compile("^" + regex_pattern + "$")
+        if self.backtrack_policy != "ignore" and (risk := backtrack_risk(regex_pattern)):
+            if self.backtrack_policy == "reject":
+                raise InvalidParam(f"{regex_pattern} 可能导致灾难性回溯: {risk}")
+            warnings.warn(f"{regex_pattern} 可能导致灾难性回溯: {risk}", RuntimeWarning, 2)
         self.token = token
         self.origin_type = origin_type
-        self.transform_action = transform_action
+        self.transform_action = transform_action or converter_map.get(origin_type, parse_literal)
         self.alias = alias
+        self.set_cache(cache_size, cache_policy)
 
     def __repr__(self):
         return self.pattern
 
-    @lru_cache(maxsize=None)
+    def set_cache(self, size: Optional[int] = None, policy: Optional[Literal["lru", "fifo"]] = None):
+        """重新设置匹配缓存, size 为 0 时关闭缓存; 未给出的项使用类上的默认值"""
+        self.cache = BoundedCache(
+            self.default_cache_size if size is None else size,
+            policy or self.default_cache_policy
+        )
+        return self
+
+    def _lookup(self, text: str):
+        """获取 text 的缓存条目 (匹配结果, 转换结果), 未命中时进行匹配"""
+        if entry := self.cache.get(text):
+            return entry
+        r = self.re_pattern.findall(text)
+        entry = (r[0] if r else None, _unconverted)
+        self.cache.set(text, entry)
+        return entry
+
     def find(self, text: str):
         """
         匹配文本, 返回匹配结果
@@ -110,8 +168,32 @@ class ArgPattern:
             return
         if self.token == PatternToken.DIRECT:
             return text
-        r = self.re_pattern.findall(text)
-        return r[0] if r else None
+        return self._lookup(text)[0]
+
+    def match(self, text: Union[str, Any]) -> Tuple[Any, Any]:
+        """
+        匹配文本并执行 transform_action, 返回匹配结果与转换后的值
+
+        转换结果为不可变对象时会与匹配结果一同缓存
+        """
+        if not isinstance(text, str) or self.token == PatternToken.DIRECT:
+            found = self.find(text)
+            return found, found
+        if entry := self.cache.get(text):
+            if entry[1] is not _unconverted:
+                return entry
+            found = entry[0]
+        else:
+            r = self.re_pattern.findall(text)
+            found = r[0] if r else None
+        value = found
+        if self.token == PatternToken.REGEX_TRANSFORM and isinstance(found, str):
+            value = self.transform_action(found)
+        if found and _is_immutable(value):
+            self.cache.set(text, (found, value))
+        elif not entry:
+            self.cache.set(text, (found, _unconverted))
+        return found, value
 
     def __getstate__(self):
         pattern = self.pattern
@@ -145,13 +227,9 @@ class Force:
 
 
 AnyStr = ArgPattern(r"(.+?)", PatternToken.DIRECT, str)
-AnyDigit = ArgPattern(r"(\-?\d+)", PatternToken.REGEX_TRANSFORM, int, lambda x: int(x))
-AnyFloat = ArgPattern(r"(\-?\d+\.?\d*)", PatternToken.REGEX_TRANSFORM, float, lambda x: float(x))
-Bool = ArgPattern(
-    r"(True|False|true|false)", PatternToken.REGEX_TRANSFORM, bool, lambda x: bool(
-        x.replace("false", "False").replace("true", "True")
-    )
-)
+AnyDigit = ArgPattern(r"(\-?\d+)", PatternToken.REGEX_TRANSFORM, int)
+AnyFloat = ArgPattern(r"(\-?\d+\.?\d*)", PatternToken.REGEX_TRANSFORM, float)
+Bool = ArgPattern(r"(True|False|true|false)", PatternToken.REGEX_TRANSFORM, bool)
 Email = ArgPattern(r"([\w\.+-]+)@([\w\.-]+)\.([\w\.-]+)", origin_type=tuple, alias="email")
 AnyIP = ArgPattern(r"(\d+)\.(\d+)\.(\d+)\.(\d+):?(\d*)", origin_type=tuple, alias="ip")
 AnyUrl = ArgPattern(r"[\w]+://[^/\s?#]+[^\s?#]+(?:\?[^\s#]*)?(?:#[^\s]*)?", origin_type=str, alias="url")
@@ -161,23 +239,80 @@ AnySet = ArgPattern(r"(\{.+?\})", token=PatternToken.REGEX_TRANSFORM, origin_typ
 AnyDict = ArgPattern(r"(\{.+?\})", token=PatternToken.REGEX_TRANSFORM, origin_type=dict)
 
 
+_array_typecodes = {int: "bBhHiIlLqQfd", float: "fd"}
+
+
+def _check_array(arg_value: Any, typecode: str, use_numpy: bool):
+    """检查 arg_value 的匹配结果能否存入以 typecode 为类型码的数组"""
+    if not isinstance(arg_value, ArgPattern) or arg_value.origin_type not in _array_typecodes:
+        raise TypeError(f"{arg_value} 的匹配结果不是数值, 无法存入数组")
+    if len(typecode) != 1 or typecode not in _array_typecodes[arg_value.origin_type]:
+        raise ValueError(f"invalid typecode for {arg_value.origin_type.__name__}: {typecode}")
+    if use_numpy:
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            raise ImportError('请先安装 numpy')
+
+
+def _pack_array(data: array, use_numpy: bool):
+    """将收集完毕的数组按需转换为 numpy 数组 (共享同一块内存)"""
+    if not use_numpy:
+        return data
+    import numpy
+    if not data:
+        return numpy.empty(0, dtype=data.typecode)
+    return numpy.frombuffer(data, dtype=data.typecode)
+
+
 class MultiArg(ArgPattern):
-    """可变参数的匹配"""
+    """
+    可变参数的匹配
+
+    指定 typecode 时, 数值类型的可变参数会被直接收集进 array.array 而不是元组;
+    use_numpy 为 True 时则进一步以 numpy 数组的形式返回
+    """
     flag: str
     arg_value: Any
+    typecode: Optional[str]
+    use_numpy: bool
 
-    def __init__(self, arg_value: Union[ArgPattern, Type], flag: Literal['args', 'kwargs'] = 'args'):
+    def __init__(
+            self,
+            arg_value: Union[ArgPattern, Type],
+            flag: Literal['args', 'kwargs'] = 'args',
+            typecode: Optional[str] = None,
+            use_numpy: bool = False
+    ):
+        if typecode:
+            if flag != 'args':
+                raise ValueError("typecode 仅适用于非键值对的可变参数")
+            if not isinstance(arg_value, ArgPattern):
+                arg_value = argtype_validator(arg_value)
+            _check_array(arg_value, typecode, use_numpy)
         if isinstance(arg_value, ArgPattern):
             alias_content = arg_value.alias or arg_value.origin_type.__name__
         else:
             alias_content = arg_value.__name__
         self.flag = flag
+        self.typecode = typecode
+        self.use_numpy = use_numpy
         if flag == 'args':
             super().__init__(r"(.+?)", token=PatternToken.DIRECT, origin_type=tuple, alias=f"*{alias_content}")
         else:
             super().__init__(r"(.+?)", token=PatternToken.DIRECT, origin_type=dict, alias=f"**{alias_content}")
         self.arg_value = arg_value
 
+    def new_result(self) -> Union[List[Any], array]:
+        """创建用于收集参数的容器"""
+        return array(self.typecode) if self.typecode else []
+
+    def pack_result(self, result: Union[List[Any], array]) -> Any:
+        """将收集到的参数转换为最终结果"""
+        if self.typecode:
+            return _pack_array(result, self.use_numpy)  # type: ignore
+        return tuple(result)
+
     def __repr__(self):
         if self.flag == 'args':
             return f"({self.arg_value}, ...)"
@@ -200,13 +335,23 @@ class AntiArg(ArgPattern):
         return f"!{self.arg_value}"
 
 
+_backref = re.compile(r"\\\d|\(\?P=")
+
+
 class UnionArg(ArgPattern):
-    """多项参数的匹配"""
+    """
+    多项参数的匹配
+
+    可哈希的候选值存放于 frozenset 中; 开头连续的一般 ArgPattern 会合并为一个带命名分组的分支正则,
+    一次匹配即可确定命中的候选项
+    """
     anti: bool
     arg_value: Sequence[Union[Type, ArgPattern, object, str]]
     for_type_check: List[Type]
     for_match: List[ArgPattern]
     for_equal: List[Union[str, object]]
+    equal_set: frozenset
+    equal_rest: List[object]
 
     __validator__: Callable = lambda x: x if isinstance(x, Sequence) else [x]
 
@@ -227,6 +372,17 @@ class UnionArg(ArgPattern):
                 self.for_type_check.append(arg)
             else:
                 self.for_equal.append(arg)
+        self.equal_rest = []
+        hashable = []
+        for arg in self.for_equal:
+            try:
+                hash(arg)
+            except TypeError:
+                self.equal_rest.append(arg)
+            else:
+                hashable.append(arg)
+        self.equal_set = frozenset(hashable)
+        self._compile_match()
         alias_content = ", ".join(
             [a.alias or a.origin_type.__name__ for a in self.for_match] +
             [repr(a) for a in self.for_equal] +
@@ -249,38 +405,140 @@ class UnionArg(ArgPattern):
     def __class_getitem__(cls, item):
         return cls(cls.__validator__(item))
 
+    def _compile_match(self):
+        """将 for_match 开头连续的一般 ArgPattern 合并为一个分支正则"""
+        self._union_count = 0
+        self._union_pattern: Optional[Pattern] = None
+        self._union_groups: Dict[int, Tuple[int, int]] = {}  # 外层分组序号 -> (候选序号, 内部分组数)
+        branches = []
+        for pat in self.for_match:
+            if (
+                pat.token == PatternToken.DIRECT or
+                pat.__class__.find is not ArgPattern.find or pat.__class__.match is not ArgPattern.match or
+                _backref.search(pat.pattern)
+            ):
+                break
+            branches.append(f"(?P<_{len(branches)}>{pat.pattern})")
+        if len(branches) < 2:
+            return
+        try:
+            union_pattern = re.compile("^(?:" + "|".join(branches) + ")$")
+        except re.error:
+            return
+        for i in range(len(branches)):
+            self._union_groups[union_pattern.groupindex[f"_{i}"]] = (i, self.for_match[i].re_pattern.groups)
+        self._union_pattern = union_pattern
+        self._union_count = len(branches)
+
+    def equals(self, arg: Any) -> bool:
+        """判断 arg 是否与某个候选值相等"""
+        try:
+            if arg in self.equal_set:
+                return True
+        except TypeError:
+            return arg in self.for_equal
+        return bool(self.equal_rest) and arg in self.equal_rest
+
+    def match_pattern(self, arg: Any, transform: bool = True) -> Tuple[Optional[ArgPattern], Any]:
+        """
+        返回第一个匹配结果为真的候选 ArgPattern 与其匹配结果, 均未匹配时返回 (None, None)
+
+        Args:
+            arg: 待匹配的参数
+            transform: 是否对匹配结果执行 transform_action
+        """
+        start = 0
+        if self._union_pattern is not None and isinstance(arg, str):
+            if not (matched := self._union_pattern.match(arg)):
+                start = self._union_count
+            else:
+                index, count = self._union_groups[matched.lastindex]  # type: ignore
+                pat = self.for_match[index]
+                if count == 0:
+                    found = matched.group(matched.lastindex)
+                else:
+                    groups = matched.groups("")[matched.lastindex:matched.lastindex + count]
+                    found = groups[0] if count == 1 else groups
+                if found:
+                    if transform and pat.token == PatternToken.REGEX_TRANSFORM and isinstance(found, str):
+                        found = pat.transform_action(found)
+                    return pat, found
+                start = index + 1  # 匹配结果为空时继续尝试后续的候选项
+        for pat in self.for_match[start:]:
+            if transform:
+                arg_find, arg_value = pat.match(arg)
+            else:
+                arg_find = arg_value = pat.find(arg)
+            if arg_find:
+                return pat, arg_value
+        return None, None
+
+
+def _split_items(text: str, pairs: bool = False) -> list:
+    """以 split_literal 切分容器的内容, 括号或引号不匹配时退回到按逗号直接切分"""
+    try:
+        return split_literal(text, pairs)
+    except ValueError:
+        items = re.split(r"\s*,\s*", text.strip())
+        if not pairs:
+            return items
+        return [tuple(kv) if len(kv := re.split(r"\s*[:=]\s*", item, 1)) == 2 else (item, None) for item in items]
+
 
 class SequenceArg(ArgPattern):
-    """匹配列表或者元组或者集合"""
+    """
+    匹配列表或者元组或者集合
+
+    指定 typecode 时, 列表或元组中的数值会被直接收集进 array.array;
+    use_numpy 为 True 时则进一步以 numpy 数组的形式返回
+    """
     form: str
     arg_value: ArgPattern
+    typecode: Optional[str]
+    use_numpy: bool
 
-    def __init__(self, arg_value: Union[ArgPattern, _AnyParam], form: str = "list"):
+    def __init__(
+            self,
+            arg_value: Union[ArgPattern, _AnyParam],
+            form: str = "list",
+            typecode: Optional[str] = None,
+            use_numpy: bool = False
+    ):
         self.arg_value = arg_value if isinstance(arg_value, ArgPattern) else AnyStr
         self.form = form
+        self.typecode = typecode
+        self.use_numpy = use_numpy
+        if typecode:
+            if form == "set":
+                raise ValueError("typecode 不适用于集合")
+            _check_array(self.arg_value, typecode, use_numpy)
         alias_content = self.arg_value.alias or self.arg_value.origin_type.__name__
 
+        def _act_array(text: str):
+            result = array(typecode)  # type: ignore
+            for s in _split_items(text):
+                arg_find, arg_value = self.arg_value.match(unquote(s))  # type: ignore
+                if not arg_find:
+                    raise ParamsUnmatched(f"{s} is not matched with {self.arg_value}")
+                try:
+                    result.append(arg_value)
+                except (OverflowError, TypeError):
+                    raise ParamsUnmatched(f"{s} can not be stored in array of typecode {typecode!r}")
+            return _pack_array(result, use_numpy)
+
         def _act(text: str):
-            sequence = re.split(r"\s*,\s*", text)
             result = []
             if isinstance(self.arg_value, UnionArg):
-                for s in sequence:
-                    for pat in self.arg_value.for_match:
-                        if arg_find := pat.find(s):
-                            if pat.token == PatternToken.REGEX_TRANSFORM:
-                                arg_find = pat.transform_action(arg_find)
-                            result.append(arg_find)
-                            break
-                    else:
+                for s in _split_items(text):
+                    if (arg_find := self.arg_value.match_pattern(unquote(s)))[0] is None:  # type: ignore
                         raise ParamsUnmatched(f"{s} is not matched in {self.arg_value}")
-
+                    result.append(arg_find[1])
             else:
-                for s in sequence:
-                    if not (arg_find := self.arg_value.find(s)):
+                for s in _split_items(text):
+                    arg_find, arg_value = self.arg_value.match(unquote(s))  # type: ignore
+                    if not arg_find:
                         raise ParamsUnmatched(f"{s} is not matched with {self.arg_value}")
-                    if self.arg_value.token == PatternToken.REGEX_TRANSFORM:
-                        arg_find = self.arg_value.transform_action(arg_find)
-                    result.append(arg_find)
+                    result.append(arg_value)
             if self.form == "list":
                 return result
             elif self.form == "tuple":
@@ -288,10 +546,11 @@ class SequenceArg(ArgPattern):
             elif self.form == "set":
                 return set(result)
 
+        action = _act_array if typecode else _act
         if form == "list":
-            super().__init__(r"\[(.+?)\]", PatternToken.REGEX_TRANSFORM, list, _act, f"List[{alias_content}]")
+            super().__init__(r"\[(.+?)\]", PatternToken.REGEX_TRANSFORM, list, action, f"List[{alias_content}]")
         elif form == "tuple":
-            super().__init__(r"\((.+?)\)", PatternToken.REGEX_TRANSFORM, tuple, _act, f"Tuple[{alias_content}]")
+            super().__init__(r"\((.+?)\)", PatternToken.REGEX_TRANSFORM, tuple, action, f"Tuple[{alias_content}]")
         elif form == "set":
             super().__init__(r"\{(.+?)\}", PatternToken.REGEX_TRANSFORM, set, _act, f"Set[{alias_content}]")
         else:
@@ -314,29 +573,20 @@ class MappingArg(ArgPattern):
         self.arg_value = arg_value if isinstance(arg_value, ArgPattern) else AnyStr
 
         def _act(text: str):
-            mapping = re.split(r"\s*,\s*", text)
             result = {}
-            for m in mapping:
-                k, v = re.split(r"\s*[:=]\s*", m)
-                if not (real_key := self.arg_key.find(k)):
+            for k, v in _split_items(text, pairs=True):
+                key_find, real_key = self.arg_key.match(unquote(k))  # type: ignore
+                if v is None or not key_find:
                     raise ParamsUnmatched(f"{k} is not matched with {self.arg_key}")
-                if self.arg_key.token == PatternToken.REGEX_TRANSFORM:
-                    real_key = self.arg_key.transform_action(real_key)
                 if isinstance(self.arg_value, UnionArg):
-                    for pat in self.arg_value.for_match:
-                        if arg_find := pat.find(v):
-                            if pat.token == PatternToken.REGEX_TRANSFORM:
-                                arg_find = pat.transform_action(arg_find)
-                            result[real_key] = arg_find
-                            break
-                    else:
+                    if (arg_find := self.arg_value.match_pattern(unquote(v)))[0] is None:
                         raise ParamsUnmatched(f"{v} is not matched in {self.arg_value}")
+                    result[real_key] = arg_find[1]
                 else:
-                    if not (arg_find := self.arg_value.find(v)):
+                    arg_find, arg_value = self.arg_value.match(unquote(v))
+                    if not arg_find:
                         raise ParamsUnmatched(f"{v} is not matched with {self.arg_value}")
-                    if self.arg_value.token == PatternToken.REGEX_TRANSFORM:
-                        arg_find = self.arg_value.transform_action(arg_find)
-                    result[real_key] = arg_find
+                    result[real_key] = arg_value
             return result
 
         alias_content = f"{self.arg_key.alias or self.arg_key.origin_type.__name__}, " \
@@ -557,17 +807,37 @@ class ObjectPattern(ArgPattern):
         super().__init__(
             _re_pattern,
             token=PatternToken.REGEX_MATCH, origin_type=self.origin, alias=head or self.origin.__name__,
+            cache_size=0
         )
+        # 预先编译构造计划: (参数名, 分组序号, 匹配方法, 转换方法), 每次匹配只需按序取值;
+        # 内联进整体表达式的子表达式若只是一个包裹全体的捕获组, 分组的内容即为其匹配结果, 无需再次匹配
+        groups = self.re_pattern.groupindex
+        plan = []
+        for k, require in self._require_map.items():
+            if k not in groups:
+                continue
+            pat = getattr(require, "__self__", None)
+            if isinstance(pat, ArgPattern) and (pat.token == PatternToken.DIRECT or whole_group(pat.pattern)):
+                require = None
+            plan.append((k, groups[k], require, self._transform_map.get(k)))
+        self._plan: Tuple[Tuple[str, int, Optional[Callable], Optional[Callable]], ...] = tuple(plan)
+        self._supplements: Tuple[Tuple[str, Callable], ...] = tuple(self._supplement_map.items())
         add_check(self)
 
     def find(self, text: str):
+        """匹配文本并构造对象; 每次调用都使用新的参数字典, 因此可被多个线程同时调用"""
         if matched := self.re_pattern.fullmatch(text):
-            args = matched.groupdict()
-            for k in self._require_map:
-                if k in args:
-                    self._params[k] = self._require_map[k](args[k])
-                    if self._transform_map.get(k, None):
-                        self._params[k] = self._transform_map[k](self._params[k])
-            for k in self._supplement_map:
-                self._params[k] = self._supplement_map[k]()
-            return self.origin(**self._params)
+            params = self._params.copy()
+            group = matched.group
+            for k, index, require, transform in self._plan:
+                value = group(index)
+                if require:
+                    value = require(value)
+                params[k] = transform(value) if transform else value
+            for k, supplier in self._supplements:
+                params[k] = supplier()
+            return self.origin(**params)
+
+    def match(self, text: Union[str, Any]) -> Tuple[Any, Any]:
+        found = self.find(text)
+        return found, found
@@ -1,9 +1,27 @@
 """杂物堆"""
+import re
 import functools
 import warnings
 import logging
+from collections import OrderedDict
 from inspect import stack
-from typing import Callable, TypeVar, Optional
+from typing import Callable, TypeVar, Optional, Any, Dict, Hashable, Literal, List, Tuple, Union
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse  # type: ignore
+except ImportError:  # Python 3.10 及以下
+    import sre_constants  # type: ignore  # pylint: disable=deprecated-module
+    import sre_parse  # type: ignore  # pylint: disable=deprecated-module
+
+# 操作码由 sre_constants 在运行时写入模块的全局变量, 静态检查无法识别, 故在此统一取出
+(
+    _LITERAL, _IN, _RANGE, _SUBPATTERN, _BRANCH, _AT, _ASSERT, _ASSERT_NOT, _MAX_REPEAT, _MIN_REPEAT, _MAXREPEAT
+) = (
+    getattr(sre_constants, name) for name in (
+        "LITERAL", "IN", "RANGE", "SUBPATTERN", "BRANCH", "AT", "ASSERT", "ASSERT_NOT",
+        "MAX_REPEAT", "MIN_REPEAT", "MAXREPEAT"
+    )
+)
 
 R = TypeVar('R')
 
@@ -17,6 +35,138 @@ class Singleton(type):
         return cls._instances[cls]
 
 
+class BoundedCache:
+    """
+    有界的缓存, 超出容量时按淘汰策略移除条目
+
+    Attributes:
+        size: 最大条目数, 为 0 时不进行缓存
+        policy: 淘汰策略, "lru" 移除最久未被使用的条目, "fifo" 移除最早加入的条目
+        hits: 命中次数
+        misses: 未命中次数
+        evictions: 淘汰次数
+    """
+    size: int
+    policy: Literal["lru", "fifo"]
+    hits: int
+    misses: int
+    evictions: int
+
+    __slots__ = "size", "policy", "data", "hits", "misses", "evictions"
+
+    def __init__(self, size: int = 256, policy: Literal["lru", "fifo"] = "lru"):
+        if policy not in ("lru", "fifo"):
+            raise ValueError(f"unknown cache policy: {policy}")
+        self.size = max(size, 0)
+        self.policy = policy
+        self.data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """获取缓存的值, 未命中时返回 None"""
+        if (value := self.data.get(key)) is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == "lru":
+            try:
+                self.data.move_to_end(key)
+            except KeyError:  # 已被其他线程淘汰
+                pass
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存, 值不应为 None"""
+        if not self.size:
+            return
+        data = self.data
+        data[key] = value
+        while len(data) > self.size:
+            try:
+                data.popitem(last=False)
+            except KeyError:
+                break
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.data.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """缓存的命中情况"""
+        return {
+            "size": len(self.data), "hits": self.hits, "misses": self.misses, "evictions": self.evictions
+        }
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"BoundedCache(size={self.size}, policy={self.policy!r}, {self.stats})"
+
+
+class PrefixTrie:
+    """
+    字符前缀树, 一次遍历即可求出文本的完全匹配或最长的前缀匹配
+
+    每个键可以只允许完全匹配, 或同时允许作为前缀匹配; 完全匹配时只能完全匹配的键优先
+    """
+    __slots__ = "_root", "_exact"
+
+    def __init__(self):
+        self._root: Dict[Optional[str], Any] = {}
+        self._exact: Dict[str, Any] = {}
+
+    def insert(self, key: str, value: Any, prefix: bool = True) -> None:
+        """插入一个键, 同一个键重复插入时保留先插入的值"""
+        if not prefix:
+            self._exact[key] = value
+            return
+        self._exact.setdefault(key, value)
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(None, value)
+
+    def longest(self, text: str) -> Tuple[Any, int]:
+        """
+        查找 text 对应的值
+
+        Returns:
+            完全匹配时为 (值, len(text)); 否则为最长的前缀匹配 (值, 前缀长度); 均不存在时为 (None, 0)
+        """
+        if (value := self._exact.get(text)) is not None:
+            return value, len(text)
+        node = self._root
+        found, end = None, 0
+        for index, char in enumerate(text, 1):
+            if (node := node.get(char)) is None:
+                break
+            if None in node:
+                found, end = node[None], index
+        return found, end
+
+    def prefixes(self, text: str) -> List[Tuple[Any, int]]:
+        """由长到短返回所有可作为 text 前缀的键对应的 (值, 前缀长度)"""
+        node = self._root
+        found = [(node[None], 0)] if None in node else []
+        for index, char in enumerate(text, 1):
+            if (node := node.get(char)) is None:
+                break
+            if None in node:
+                found.append((node[None], index))
+        found.reverse()
+        return found
+
+    def __len__(self):
+        return len(self._exact)
+
+    def __repr__(self):
+        return f"PrefixTrie({list(self._exact)})"
+
+
 def get_module_name() -> Optional[str]:
     """获取当前模块名"""
     for frame in stack():
@@ -38,8 +188,8 @@ def get_module_filepath() -> Optional[str]:
             return ".".join(frame.filename.split("/")[1:]).replace('.py', '')
 
 
-def split_once(text: str, separate: str):  # 相当于另类的pop, 不会改变本来的字符串
-    """单次分隔字符串"""
+def _split_once_chars(text: str, separate: str):
+    """split_once 的逐字符实现, 用于处理含有引号的文本"""
     out_text = []
     quotation = ""
     is_split = True
@@ -58,16 +208,18 @@ def split_once(text: str, separate: str):  # 相当于另类的pop, 不会改变
     return result, text.lstrip(result + separate)
 
 
-def split(text: str, separate: str = " ", ):
-    """尊重引号与转义的字符串切分
+def split_once(text: str, separate: str):  # 相当于另类的pop, 不会改变本来的字符串
+    """单次分隔字符串"""
+    if len(separate) != 1:  # 多字符的分隔符永远不会与单个字符相等
+        return text, ""
+    if "'" not in text and '"' not in text:
+        out_text = text.partition(separate)[0]
+        return out_text, text.lstrip(out_text + separate)
+    return _split_once_chars(text, separate)
 
-    Args:
-        text (str): 要切割的字符串
-        separate (str): 切割符. 默认为 " ".
 
-    Returns:
-        List[str]: 切割后的字符串, 可能含有空格
-    """
+def _split_chars(text: str, separate: str = " "):
+    """split 的逐字符实现, 用于处理含有引号或转义符的文本"""
     result = []
     quote = ""
     cache = []
@@ -93,6 +245,284 @@ def split(text: str, separate: str = " ", ):
     return result
 
 
+_line_breaks = re.compile(r"[\r\n]")
+
+
+def split(text: str, separate: str = " ", ):
+    """尊重引号与转义的字符串切分
+
+    不含引号与转义符的文本会直接交给 str.split 处理, 其余情况回退到逐字符的实现
+
+    Args:
+        text (str): 要切割的字符串
+        separate (str): 切割符. 默认为 " ".
+
+    Returns:
+        List[str]: 切割后的字符串, 可能含有空格
+    """
+    if len(separate) != 1 or "'" in text or '"' in text or "\\" in text:
+        return _split_chars(text, separate)
+    if "\n" not in text and "\r" not in text:
+        return [s for s in text.split(separate) if s]
+    if separate in ("\n", "\r"):
+        return _split_chars(text, separate)
+    # 换行符总会截断当前的片段, 即使片段为空
+    result = []
+    lines = _line_breaks.split(text)
+    for line in lines[:-1]:
+        parts = line.split(separate)
+        result.extend(s for s in parts[:-1] if s)
+        result.append(parts[-1])
+    result.extend(s for s in lines[-1].split(separate) if s)
+    return result
+
+
+def literal_prefix(pattern: str) -> str:
+    """获取正则表达式的匹配结果必定以之开头的字面量前缀, 无法确定时返回空字符串"""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return ""
+    state = getattr(parsed, "state", None) or parsed.pattern
+    if state.flags & re.IGNORECASE:
+        return ""
+    chars = []
+    for op, av in parsed:
+        if op is not _LITERAL:
+            break
+        chars.append(chr(av))
+    return "".join(chars)
+
+
+def whole_group(pattern: str) -> bool:
+    """判断正则表达式是否恰好由一个包裹全体的捕获组构成, 此时其匹配结果即为整段文本"""
+    if not (pattern.startswith("(") and pattern.endswith(")")) or pattern.strip("()") != pattern[1:-1]:
+        return False
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return False
+    if len(parsed) != 1 or parsed[0][0] is not _SUBPATTERN:
+        return False
+    return parsed[0][1][0] == 1 and (getattr(parsed, "state", None) or parsed.pattern).groups == 2
+
+
+_REPEATS = (_MAX_REPEAT, _MIN_REPEAT)
+
+
+def _repeat_kind(av) -> int:
+    """重复的种类: 0 为至多一次, 1 为有界的多次, 2 为无界的可变次数"""
+    if av[1] <= 1:
+        return 0
+    return 2 if av[1] == _MAXREPEAT and av[0] != av[1] else 1
+
+
+def _first_chars(items) -> Optional[set]:
+    """估算表达式首个字符的可能取值, 无法确定 (或可能为空匹配) 时返回 None"""
+    for op, av in items:
+        if op is _LITERAL:
+            return {av}
+        if op is _IN:
+            chars = set()
+            for i_op, i_av in av:
+                if i_op is _LITERAL:
+                    chars.add(i_av)
+                elif i_op is _RANGE and i_av[1] - i_av[0] < 256:
+                    chars.update(range(i_av[0], i_av[1] + 1))
+                else:
+                    return None
+            return chars
+        if op is _SUBPATTERN:
+            return _first_chars(av[-1])
+        if op is _BRANCH:
+            chars = set()
+            for branch in av[1]:
+                if (sub := _first_chars(branch)) is None:
+                    return None
+                chars |= sub
+            return chars
+        if op in _REPEATS and av[0] > 0:
+            return _first_chars(av[2])
+        if op is _AT:
+            continue
+        return None
+    return None
+
+
+def _scan_risk(items, outer: int) -> Optional[str]:
+    for op, av in items:
+        if op in _REPEATS:
+            kind = _repeat_kind(av)
+            # 无界量词内再有可变量词, 或多次重复的分组内有无界量词
+            if (outer == 2 and av[0] != av[1] and av[1] > 1) or (outer and kind == 2):
+                return "nested quantifiers"
+            if risk := _scan_risk(av[2], max(outer, kind)):
+                return risk
+        elif op is _BRANCH:
+            if outer == 2:
+                seen: set = set()
+                for branch in av[1]:
+                    if (chars := _first_chars(branch)) is None or seen & chars:
+                        return "ambiguous alternation inside a quantifier"
+                    seen |= chars
+            for branch in av[1]:
+                if risk := _scan_risk(branch, outer):
+                    return risk
+        elif op is _SUBPATTERN:
+            if risk := _scan_risk(av[-1], outer):
+                return risk
+        elif op in (_ASSERT, _ASSERT_NOT):
+            if risk := _scan_risk(av[1], outer):
+                return risk
+    return None
+
+
+@functools.lru_cache(maxsize=512)
+def backtrack_risk(pattern: str) -> Optional[str]:
+    """
+    分析正则表达式中可能导致灾难性 (指数级) 回溯的结构, 返回对该结构的描述; 未发现时返回 None
+
+    目前识别两类结构: 嵌套的可变量词 (如 (a+)+), 以及无界量词内首字符有重叠的分支 (如 (a|ab)*)
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return None
+    return _scan_risk(parsed, 0)
+
+
+_literal_token = re.compile(r"""[,:=\[\](){}'"]""")
+_literal_int = re.compile(r"[-+]?\d+")
+_literal_float = re.compile(r"[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?")
+_literal_const = {"True": True, "False": False, "None": None}
+_brackets = {"[": "]", "(": ")", "{": "}"}
+
+
+def split_literal(
+        text: str, pairs: bool = False
+) -> Union[List[str], List[Tuple[str, Optional[str]]]]:
+    """
+    按顶层的逗号切分容器字面量的内容, 嵌套括号与引号内的逗号不会被切分; 末尾多余的逗号会被忽略
+
+    Args:
+        text (str): 去掉最外层括号后的内容
+        pairs (bool): 为真时将每一项按顶层首个 ':' 或 '=' 切分为 (键, 值), 没有分隔符的项其值为 None
+
+    Returns:
+        去除了首尾空白的各项
+    """
+    items: list = []
+    stack: List[str] = []
+    start = 0
+    colon = -1
+    pos = 0
+    search = _literal_token.search
+    while matched := search(text, pos):
+        index = matched.start()
+        char = text[index]
+        pos = index + 1
+        if char in ("'", '"'):
+            while True:  # 跳过引号括起的部分, 奇数个反斜杠表示转义
+                if (end := text.find(char, pos)) == -1:
+                    raise ValueError(f"unterminated string in {text!r}")
+                slashes = 0
+                while text[end - 1 - slashes] == "\\":
+                    slashes += 1
+                pos = end + 1
+                if slashes % 2 == 0:
+                    break
+        elif char in _brackets:
+            stack.append(_brackets[char])
+        elif char in ")]}":
+            if not stack or stack.pop() != char:
+                raise ValueError(f"unbalanced brackets in {text!r}")
+        elif stack:
+            continue
+        elif char == ",":
+            items.append((start, index, colon))
+            start, colon = pos, -1
+        elif pairs and colon == -1:
+            colon = index
+    if stack:
+        raise ValueError(f"unbalanced brackets in {text!r}")
+    if text[start:].strip() or not items:
+        items.append((start, len(text), colon))
+    if not pairs:
+        return [text[b:e].strip() for b, e, _ in items]
+    return [
+        (text[b:e].strip(), None) if c == -1 else (text[b:c].strip(), text[c + 1:e].strip())
+        for b, e, c in items
+    ]
+
+
+def unquote(text: str) -> str:
+    """去除包裹整段文本的引号, 并处理其中的转义"""
+    if len(text) > 1 and text[0] in ("'", '"') and text[-1] == text[0]:
+        return re.sub(r"\\(.)", r"\1", text[1:-1])
+    return text
+
+
+def parse_literal(text: str) -> Any:
+    """
+    解析 Python 风格的字面量, 支持嵌套的列表、元组、集合与字典
+
+    只识别数字、True/False/None 与字符串, 不会执行任何代码; 接受的文法为:
+
+        literal := list | tuple | set | dict | string | number | const | bare
+        list    := "[" [items] "]"
+        tuple   := "(" [items] ")"          没有逗号时只是带括号的 literal, 如 "(1)" 为 1
+        set     := "{" items "}"
+        dict    := "{" pair ("," pair)* [","] "}"
+        items   := literal ("," literal)* [","]
+        pair    := literal (":" | "=") literal
+        string  := 以 ' 或 " 包裹的文本, 反斜杠转义其后的任意字符 (见 unquote)
+        number  := 可带正负号与指数的十进制整数或浮点数, 如 -3、.5、1e5
+        const   := True | False | None
+        bare    := 不以括号或引号开头的其他文本, 原样作为字符串
+
+    括号与引号内的逗号不会切分各项, 各项首尾的空白会被去除.
+    与先前使用 eval 的实现不同: 未加引号的文本不再报错而是视为字符串, 如 "[1 2]" 为 ['1 2'];
+    十六进制等其他进制以及带下划线的数字不被识别, 如 "0x10" 与 "1_000" 均为字符串.
+    文本为空 (包括容器中的空项)、括号或引号不配对, 以及字典中混有不带值的项时抛出 ValueError
+    """
+    text = text.strip()
+    if not text:
+        raise ValueError("empty literal")
+    head, tail = text[0], text[-1]
+    if head == "[" and tail == "]":
+        inner = text[1:-1]
+        return [parse_literal(s) for s in split_literal(inner)] if inner.strip() else []
+    if head == "(" and tail == ")":
+        inner = text[1:-1].strip()
+        if not inner:
+            return ()
+        items = split_literal(inner)
+        if len(items) == 1 and not inner.endswith(","):  # 没有逗号时只是带括号的表达式
+            return parse_literal(items[0])  # type: ignore
+        return tuple(parse_literal(s) for s in items)  # type: ignore
+    if head == "{" and tail == "}":
+        inner = text[1:-1]
+        if not inner.strip():
+            return {}
+        items = split_literal(inner, pairs=True)
+        if all(v is None for _, v in items):
+            return {parse_literal(k) for k, _ in items}
+        if any(v is None for _, v in items):
+            raise ValueError(f"invalid mapping literal {text!r}")
+        return {parse_literal(k): parse_literal(v) for k, v in items}  # type: ignore
+    if head in ("'", '"') and tail == head and len(text) > 1:
+        return unquote(text)
+    if _literal_int.fullmatch(text):
+        return int(text)
+    if _literal_float.fullmatch(text):
+        return float(text)
+    if text in _literal_const:
+        return _literal_const[text]
+    if text[0] in _brackets or text[0] in ")]}\'\"":
+        raise ValueError(f"malformed literal {text!r}")
+    return text
+
+
 def deprecated(remove_ver: str) -> Callable[[Callable[..., R]], Callable[..., R]]:
     """标注一个方法 / 函数已被弃用"""
 
@@ -0,0 +1,22 @@
+import time
+from arclet.alconna import Alconna, Args, Option
+
+alc = Alconna(
+    command="profile",
+    main_args=Args["name":str, "age":int, "height":float, "city":str, "@level":int, "?tag":str, "score":int:0],
+    options=[Option("--verbose|-v")]
+)
+messages = [
+    "profile alice 18 1.65 beijing level=3 vip 100",
+    "profile bob 20 1.80 shanghai level=1 -v",
+]
+count = 20000
+
+if __name__ == "__main__":
+    for msg in messages:
+        assert alc.parse(msg).matched
+        st = time.perf_counter()
+        for _ in range(count):
+            alc.parse(msg)
+        ed = time.perf_counter()
+        print(f"{msg!r}: {count / (ed - st):.2f}msg/s")
@@ -0,0 +1,44 @@
+import time
+from arclet.alconna import Alconna, Args, Option
+from arclet.alconna.builtin.analyser import CompiledCommandAnalyser, DisorderCommandAnalyser
+
+
+def build(analyser_type, name):
+    """含默认值与带参选项, 使用生成源码的解析函数"""
+    return Alconna(
+        headers=["/", "!"],
+        command=name,
+        main_args=Args["city":str, "days":int:1],
+        options=[Option("--unit|-u", Args["unit":str:"c"]), Option("--detail|-d")],
+        analyser_type=analyser_type
+    )
+
+
+def build_regular(analyser_type, name):
+    """仅含必需的位置参数与无参选项, 使用单个正则的解析函数"""
+    return Alconna(
+        headers=["/", "!"],
+        command=name,
+        main_args=Args["city":str, "days":int, "hour":int],
+        options=[Option("--detail|-d"), Option("--quiet|-q")],
+        analyser_type=analyser_type
+    )
+
+
+samples = [
+    (build(DisorderCommandAnalyser, "weather"), "北京 3 -u f --detail"),
+    (build(CompiledCommandAnalyser, "weather_fast"), "北京 3 -u f --detail"),
+    (build_regular(DisorderCommandAnalyser, "forecast"), "北京 3 12 --detail -q"),
+    (build_regular(CompiledCommandAnalyser, "forecast_fast"), "北京 3 12 --detail -q"),
+]
+count = 20000
+
+if __name__ == "__main__":
+    for alc, args in samples:
+        msg = f"/{alc.command} {args}"
+        assert alc.parse(msg).matched
+        st = time.perf_counter()
+        for _ in range(count):
+            alc.parse(msg)
+        ed = time.perf_counter()
+        print(f"{alc.command}: {count / (ed - st):.2f}msg/s")
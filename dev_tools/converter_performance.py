@@ -0,0 +1,30 @@
+import time
+from arclet.alconna import Alconna, Args, PatternToken
+from arclet.alconna.types import ArgPattern
+
+# 旧版本中经由 eval 转换的数字参数
+legacy_int = ArgPattern(r"(\-?\d+)", PatternToken.REGEX_TRANSFORM, int, lambda x: eval(x), cache_size=0)
+legacy_float = ArgPattern(r"(\-?\d+\.?\d*)", PatternToken.REGEX_TRANSFORM, float, lambda x: eval(x), cache_size=0)
+current_int = ArgPattern(r"(\-?\d+)", PatternToken.REGEX_TRANSFORM, int, cache_size=0)
+current_float = ArgPattern(r"(\-?\d+\.?\d*)", PatternToken.REGEX_TRANSFORM, float, cache_size=0)
+
+legacy = Alconna(
+    command="legacy_calc",
+    main_args=Args["a":legacy_int, "b":legacy_int, "c":legacy_float, "d":legacy_float, "e":legacy_int]
+)
+current = Alconna(
+    command="calc",
+    main_args=Args["a":current_int, "b":current_int, "c":current_float, "d":current_float, "e":current_int]
+)
+cached = Alconna(command="cached_calc", main_args=Args["a":int, "b":int, "c":float, "d":float, "e":int])
+
+count = 20000
+
+if __name__ == "__main__":
+    for alc in (legacy, current, cached):
+        msg = f"{alc.command} 12 -345 6.78 -0.5 9000"
+        st = time.perf_counter()
+        for i in range(count):
+            alc.parse(msg)
+        ed = time.perf_counter()
+        print(f"{alc.command}: {count / (ed - st):.2f}msg/s")
@@ -0,0 +1,41 @@
+import time
+from arclet.alconna import Alconna, Args, AnyParam
+
+
+class Plain:
+    type = "Plain"
+
+    def __init__(self, text):
+        self.text = text
+
+
+class At:
+    type = "At"
+
+    def __init__(self, target):
+        self.target = target
+
+
+class Face:
+    type = "Face"
+
+    def __init__(self, face_id):
+        self.face_id = face_id
+
+
+class Source:
+    type = "Source"
+
+
+alc = Alconna(command="poke", main_args=Args["target":AnyParam])
+
+chain = [Source(), Plain("poke")] + [At(i) if i % 2 else Face(i) for i in range(40)]
+count = 20000
+
+if __name__ == "__main__":
+    analyser = alc.analyser_type(alc)
+    st = time.perf_counter()
+    for _ in range(count):
+        analyser.tokenize(chain)
+    ed = time.perf_counter()
+    print(f"tokenize ({len(chain)} units): {(ed - st) / count * 1e6:.2f}us")
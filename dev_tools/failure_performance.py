@@ -0,0 +1,31 @@
+import time
+from arclet.alconna import Alconna, Option, Args
+
+alc = Alconna(
+    headers=["/", "!"],
+    command="weather",
+    options=[Option("--day|-d", Args["day":int])],
+    main_args=Args["city":str]
+)
+
+samples = {
+    "chat": "今天天气不错, 出去走走吧",
+    "head_miss": "!weathe 北京 --day 3",
+    "arg_miss": "/weather 北京 --day x",
+}
+count = 20000
+
+if __name__ == "__main__":
+    for name, msg in samples.items():
+        st = time.perf_counter()
+        for _ in range(count):
+            alc.parse(msg)
+        ed = time.perf_counter()
+        lazy = (ed - st) / count * 1e6
+        st = time.perf_counter()
+        for _ in range(count):
+            res = alc.parse(msg)
+            _ = res.error_info, res.error_data
+        ed = time.perf_counter()
+        full = (ed - st) / count * 1e6
+        print(f"miss[{name}]: {lazy:.2f}us/msg, with error_info/error_data {full:.2f}us/msg")
@@ -0,0 +1,33 @@
+import time
+from arclet.alconna import Alconna, Args, Option, command_manager
+
+alc = Alconna(
+    headers=["/", "!"],
+    command="weather",
+    options=[Option("--day|-d", Args["day":int])],
+    main_args=Args["city":str]
+)
+for i in range(50):
+    Alconna(headers=["/", "!"], command=f"cmd{i}", main_args=Args["x":int], namespace="Probe")
+
+samples = {
+    "hit": "/weather 北京 --day 3 " + "附加内容 " * 50,
+    "miss": "/weathe 北京 --day 3 " + "附加内容 " * 50,
+}
+count = 20000
+
+if __name__ == "__main__":
+    for name, msg in samples.items():
+        st = time.perf_counter()
+        for _ in range(count):
+            alc.parse(msg)
+        mid = time.perf_counter()
+        for _ in range(count):
+            alc.matches_head(msg)
+        ed = time.perf_counter()
+        print(f"{name}: parse {(mid - st) / count * 1e6:.2f}us, matches_head {(ed - mid) / count * 1e6:.2f}us")
+    st = time.perf_counter()
+    for _ in range(count):
+        command_manager.matches_head("/cmd49 1", "Probe")
+    ed = time.perf_counter()
+    print(f"manager (50 commands): {(ed - st) / count * 1e6:.2f}us")
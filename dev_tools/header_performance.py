@@ -0,0 +1,58 @@
+import re
+import time
+from arclet.alconna import Alconna, Args
+from arclet.alconna.types import ArgPattern
+from arclet.alconna.analysis.header import HeaderMatcher
+
+
+class At:
+    def __init__(self, target: int):
+        self.target = target
+
+    def __eq__(self, other):
+        return isinstance(other, At) and other.target == self.target
+
+    def __hash__(self):
+        return hash(self.target)
+
+
+prefixes = [f"p{i}." for i in range(300)] + ["!", "/"]
+mentions = [At(i) for i in range(300)]
+count = 20000
+
+
+def legacy_text(command: str):
+    """旧版本中将所有文本命令头拼接为一个正则表达式"""
+    return ArgPattern("(?:{})".format("|".join(map(re.escape, prefixes))) + command, cache_size=0).find
+
+
+if __name__ == "__main__":
+    for command, token in (("weather", "p299.weather"), ("weather", "hello"), (r"ban(\d+)", "p150.ban42")):
+        legacy, matcher = legacy_text(command), HeaderMatcher(command, prefixes)  # type: ignore
+        assert legacy(token) == matcher.text.find(token)  # type: ignore
+        st = time.perf_counter()
+        for _ in range(count):
+            legacy(token)
+        mid = time.perf_counter()
+        for _ in range(count):
+            matcher.text.find(token)  # type: ignore
+        ed = time.perf_counter()
+        print(f"text {command!r} {token!r}: legacy {(mid - st) / count * 1e6:.3f}us, matcher {(ed - mid) / count * 1e6:.3f}us")
+
+    matcher = HeaderMatcher("weather", mentions)  # type: ignore
+    head = At(299)
+    st = time.perf_counter()
+    for _ in range(count):
+        head in mentions
+    mid = time.perf_counter()
+    for _ in range(count):
+        matcher.heads(head, False)
+    ed = time.perf_counter()
+    print(f"element At(299): legacy {(mid - st) / count * 1e6:.3f}us, matcher {(ed - mid) / count * 1e6:.3f}us")
+
+    alc = Alconna(command="weather", headers=prefixes, main_args=Args["city":str])
+    st = time.perf_counter()
+    for _ in range(count):
+        alc.parse("p299.weather 北京")
+    ed = time.perf_counter()
+    print(f"parse: {count / (ed - st):.2f}msg/s")
@@ -0,0 +1,20 @@
+import time
+from typing import List, Dict
+from arclet.alconna import Alconna, Args
+
+typed = Alconna(command="typed", main_args=Args["l":List[int]])
+untyped = Alconna(command="untyped", main_args=Args["l":list])
+mapping = Alconna(command="mapping", main_args=Args["d":Dict[str, int]])
+
+if __name__ == "__main__":
+    for n in (1000, 10000, 50000):
+        payloads = {
+            typed: "[" + ",".join(str(i) for i in range(n)) + "]",
+            untyped: "[" + ",".join(f"[{i},{i}]" for i in range(n)) + "]",
+            mapping: "{" + ",".join(f"k{i}:{i}" for i in range(n)) + "}",
+        }
+        for alc, payload in payloads.items():
+            st = time.perf_counter()
+            alc.parse(f"{alc.command} {payload}")
+            ed = time.perf_counter()
+            print(f"{alc.command}[{n}]: {(ed - st) * 1000:.2f}ms")
@@ -0,0 +1,36 @@
+import sys
+import time
+from arclet.alconna import Alconna, Args, MultiArg
+
+varargs = Alconna(command="ids", main_args=Args["*ids":int, "tail":str])
+kwargs = Alconna(command="kws", main_args=Args["**kws":int, "tail":str])
+typed = Alconna(command="arr", main_args=Args["*arr":MultiArg(int, typecode="q"), "tail":str])
+
+size = 10000
+numbers = " ".join(str(i) for i in range(size))
+samples = {
+    "varargs": (varargs, f"ids {numbers} end"),
+    "kwargs": (kwargs, "kws " + " ".join(f"k{i}={i}" for i in range(size)) + " end"),
+    "typed": (typed, f"arr {numbers} end"),
+}
+count = 20
+
+
+def footprint(value):
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+if __name__ == "__main__":
+    for name, (alc, msg) in samples.items():
+        res = alc.parse(msg)
+        assert res.matched and len(res.main_args[f"{alc.command}"]) == size, res.error_info
+        st = time.perf_counter()
+        for _ in range(count):
+            alc.parse(msg)
+        ed = time.perf_counter()
+        size_kb = footprint(res.main_args[alc.command]) / 1024
+        print(f"{name}[{size}]: {(ed - st) / count * 1000:.2f}ms/msg, result {size_kb:.1f}KiB")
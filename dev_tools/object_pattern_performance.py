@@ -0,0 +1,46 @@
+import time
+from arclet.alconna.types import ObjectPattern
+
+
+class Person:
+    def __init__(self, name: str, age: int, city: str):
+        self.name = name
+        self.age = age
+        self.city = city
+
+
+def legacy_find(pattern: ObjectPattern, text: str):
+    """旧版本中直接写入共享参数字典的 find"""
+    if matched := pattern.re_pattern.fullmatch(text):
+        args = matched.groupdict()
+        for k in pattern._require_map:
+            if k in args:
+                pattern._params[k] = pattern._require_map[k](args[k])
+                if pattern._transform_map.get(k, None):
+                    pattern._params[k] = pattern._transform_map[k](pattern._params[k])
+        for k in pattern._supplement_map:
+            pattern._params[k] = pattern._supplement_map[k]()
+        return pattern.origin(**pattern._params)
+
+
+samples = {
+    "http": (ObjectPattern(Person, flag="http"), "name=alice&age=18&city=beijing"),
+    "part": (ObjectPattern(Person, flag="part"), "alice;18;beijing"),
+    "json": (ObjectPattern(Person, flag="json"), "{'name':'alice','age':'18','city':'beijing'}"),
+}
+count = 50000
+
+if __name__ == "__main__":
+    for flag, (pattern, text) in samples.items():
+        assert pattern.find(text).age == legacy_find(pattern, text).age == 18
+        st = time.perf_counter()
+        for _ in range(count):
+            legacy_find(pattern, text)
+        ed = time.perf_counter()
+        old = count / (ed - st)
+        st = time.perf_counter()
+        for _ in range(count):
+            pattern.find(text)
+        ed = time.perf_counter()
+        new = count / (ed - st)
+        print(f"{flag}: legacy {old:.2f}obj/s, current {new:.2f}obj/s, x{new / old:.2f}")
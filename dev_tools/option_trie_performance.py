@@ -0,0 +1,47 @@
+import time
+from arclet.alconna import Alconna, Args, Option
+from arclet.alconna.analysis import compile
+
+alc = Alconna(
+    command="many",
+    main_args=Args["target":str],
+    options=[Option(f"--option{i}|-o{i}", Args["value":int]) for i in range(40)] + [Option("--num|-n", Args["n":int])]
+)
+analyser = compile(alc)
+params = analyser.params
+tokens = ["北京", "--option39", "-o39", "-n123", "-x", "--num"]
+count = 20000
+
+
+def legacy_lookup(text: str):
+    """旧版本中的查找方式: 名称完全匹配失败后依次比较各参数的别名前缀"""
+    if not (param := params.get(text)) and text != "":
+        for p in params:
+            if text.startswith(getattr(params[p], 'alias', p)):
+                return params[p]
+    return param
+
+
+if __name__ == "__main__":
+    trie = analyser.params_trie
+    for text in tokens:
+        # 旧方式只取第一个匹配的别名, 因此 -o39 会被当作 -o3
+        legacy, (found, end) = legacy_lookup(text), trie.longest(text)
+        st = time.perf_counter()
+        for _ in range(count):
+            legacy_lookup(text)
+        mid = time.perf_counter()
+        for _ in range(count):
+            trie.longest(text)
+        ed = time.perf_counter()
+        print(
+            f"{text!r}: legacy {getattr(legacy, 'name', None)} {(mid - st) / count * 1e6:.3f}us, "
+            f"trie {getattr(found, 'name', None)}[:{end}] {(ed - mid) / count * 1e6:.3f}us"
+        )
+    msg = "many 北京 " + " ".join(f"-o{i} {i}" for i in range(0, 40, 4)) + " -n123"
+    assert alc.parse(msg).matched
+    st = time.perf_counter()
+    for _ in range(count):
+        alc.parse(msg)
+    ed = time.perf_counter()
+    print(f"parse: {count / (ed - st):.2f}msg/s")
@@ -0,0 +1,29 @@
+import time
+from arclet.alconna import Alconna, Args, command_manager
+
+alcs = [
+    Alconna(headers=["/", "!"], command=f"cmd{i}", main_args=Args["x":int, "text":str], namespace="Shared")
+    for i in range(30)
+]
+alcs.append(Alconna(headers=["/", "!"], command="cmd.*", main_args=Args["x":int, "text":str], namespace="Shared"))
+
+msg = '/cmd29 1 "' + '引号中的 内容 ' * 50 + '"'
+count = 2000
+
+if __name__ == "__main__":
+    st = time.perf_counter()
+    for _ in range(count):
+        for alc in alcs:
+            alc.parse(msg)
+    mid = time.perf_counter()
+    for _ in range(count):
+        streams = {}
+        for alc in alcs:
+            alc.parse(command_manager.require(alc).tokenize_shared(msg, streams))
+    ed = time.perf_counter()
+    print(f"parse each: {(mid - st) / count * 1e6:.2f}us, shared tokens: {(ed - mid) / count * 1e6:.2f}us")
+    st = time.perf_counter()
+    for _ in range(count):
+        results = command_manager.broadcast(msg, "Shared", multi=True)
+    ed = time.perf_counter()
+    print(f"broadcast multi ({len(results)} matched): {(ed - st) / count * 1e6:.2f}us")
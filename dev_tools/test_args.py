@@ -66,3 +66,80 @@ arg9 = Args["@bar":int]
 print("arg9:", arg9)
 print(analyse_args(arg9, "bar=123"))  # OK
 print(analyse_args(arg9, "123"))  # error
+
+print("\nArgs Feature: Typed array default")
+from arclet.alconna import Alconna
+from arclet.alconna.types import MultiArg
+alc_array_default = Alconna(command="m", main_args=Args["n":MultiArg(int, typecode="i"):"x"]["s":str])
+res = alc_array_default.parse("m foo")
+print(res.matched, res.error_info)
+assert not res.matched and res.exception.__class__.__name__ == "ParamsUnmatched"  # 默认值无法存入数组时失配, 而非抛出
+res = Alconna(command="m2", main_args=Args["n":MultiArg(int, typecode="i"):7]["s":str]).parse("m2 foo")
+print(res.main_args)
+assert res.main_args["n"].tolist() == [7] and res.main_args["s"] == "foo"
+
+print("\nArgs Feature: Typed array")
+from arclet.alconna.types import SequenceArg, argtype_validator
+alc_array = Alconna(command="arr", main_args=Args["n":MultiArg(int, typecode="b")])
+res = alc_array.parse("arr 1 -2")
+print(res.main_args)
+assert res.main_args["n"].typecode == "b" and res.main_args["n"].tolist() == [1, -2]
+res = alc_array.parse("arr 1 2 300")  # 300 超出 'b' 的表示范围, 不被收集
+print(res.matched, res.error_data)
+assert not res.matched and res.error_data == ["300"]
+alc_seq_array = Alconna(command="seq_arr", main_args=Args["v":SequenceArg(argtype_validator(int), "list", typecode="b")])
+print(alc_seq_array.parse("seq_arr [1,2]").main_args)
+assert alc_seq_array.parse("seq_arr [1,2]").main_args["v"].tolist() == [1, 2]
+res = alc_seq_array.parse("seq_arr [1,300]")
+print(res.matched, res.error_info)
+assert not res.matched and res.exception.__class__.__name__ == "ParamsUnmatched"
+assert Alconna(
+    command="float_arr", main_args=Args["v":MultiArg(float, typecode="d")]
+).parse("float_arr 1.5 2").main_args["v"].tolist() == [1.5, 2.0]
+for build, exc_type in (
+    (lambda: MultiArg(str, typecode="i"), TypeError),
+    (lambda: MultiArg(float, typecode="i"), ValueError),
+    (lambda: SequenceArg(argtype_validator(int), "set", typecode="i"), ValueError),
+):
+    try:
+        build()
+    except exc_type as e:
+        print(repr(e))
+    else:
+        raise AssertionError(f"{exc_type.__name__} expected")
+try:
+    import numpy
+except ImportError:
+    try:
+        MultiArg(int, typecode="i", use_numpy=True)
+    except ImportError as e:
+        print(repr(e))
+    else:
+        raise AssertionError("ImportError expected without numpy")
+else:
+    res = Alconna(
+        command="np_arr", main_args=Args["v":MultiArg(int, typecode="i", use_numpy=True)]
+    ).parse("np_arr 1 2 3")
+    assert isinstance(res.main_args["v"], numpy.ndarray) and res.main_args["v"].tolist() == [1, 2, 3]
+
+print("\nArgs Feature: Converter")
+from arclet.alconna.types import ArgPattern, PatternToken, add_converter, converter_map
+assert analyse_args(arg2, "123 False") == {"foo": 123, "de": False}  # "False" 不再被转换为 True
+alc_bool = Alconna(command="bool_cmd", main_args=Args["v":bool])
+for text, expected in (("True", True), ("true", True), ("False", False), ("false", False)):
+    assert alc_bool.parse(f"bool_cmd {text}").main_args == {"v": expected}
+assert not alc_bool.parse("bool_cmd no").matched
+print("bool ok")
+
+
+class Point:
+    def __init__(self, x: int, y: int):
+        self.x, self.y = x, y
+
+
+add_converter(Point, lambda text: Point(*map(int, text.split(","))))
+point = ArgPattern(r"(\d+,\d+)", PatternToken.REGEX_TRANSFORM, Point, cache_size=0)
+found, value = point.match("3,4")
+print(found, value.x, value.y)
+assert (value.x, value.y) == (3, 4)
+del converter_map[Point]
@@ -0,0 +1,67 @@
+import warnings
+
+from arclet.alconna import Alconna, Args, Option, ExceedParseBudget, InvalidParam, ParamsUnmatched
+from arclet.alconna.types import ArgPattern, MultiArg, AnyDigit
+
+print("\nBudget: max_steps")
+alc = Alconna(command="steps", main_args=Args["nums":MultiArg(AnyDigit)], max_steps=5, namespace="TestBudget")
+res = alc.parse("steps 1 2 3")
+print(res.matched, res.main_args)
+assert res.matched and res.main_args == {"nums": (1, 2, 3)}
+res = alc.parse("steps " + " ".join("1" * 20))
+print(res.error_info)
+assert res.matched is False and isinstance(res.exception, ExceedParseBudget)
+try:
+    Alconna(
+        command="steps", main_args=Args["nums":MultiArg(AnyDigit)], max_steps=5,
+        is_raise_exception=True, namespace="TestBudget1"
+    ).parse("steps " + " ".join("1" * 20))
+except ExceedParseBudget as e:
+    print(e)
+else:
+    raise AssertionError("ExceedParseBudget not raised")
+res = alc.parse("steps 1 2 3")  # 预算在每次解析时重新计算
+assert res.matched
+
+print("\nBudget: max_time")
+alc1 = Alconna(
+    command="timed", options=[Option("-v")], max_time=0.0, namespace="TestBudget"
+)
+res = alc1.parse("timed -v -v -v")
+print(res.error_info)
+assert res.matched is False and isinstance(res.exception, ExceedParseBudget)
+assert Alconna(command="timed", options=[Option("-v")], max_time=10, namespace="TestBudget1").parse("timed -v").matched
+
+print("\nBudget: a slow regex match reports ExceedParseBudget")
+ArgPattern.backtrack_policy = "ignore"
+slow = ArgPattern(r"((a+)+b)")
+ArgPattern.backtrack_policy = "warn"
+alc2 = Alconna(command="slow", main_args=Args["x":slow], max_time=0.05, namespace="TestBudget")
+res = alc2.parse("slow " + "a" * 22 + "c")  # 单次匹配无法被中断, 匹配结束后再检查截止时间
+print(res.error_info)
+assert res.matched is False and isinstance(res.exception, ExceedParseBudget)
+alc3 = Alconna(command="slow", main_args=Args["x":slow], namespace="TestBudget1")
+assert isinstance(alc3.parse("slow " + "a" * 10 + "c").exception, ParamsUnmatched)
+assert alc2.parse("slow aab").main_args == {"x": ("aab", "aa")}
+
+print("\nBudget: backtrack policy")
+with warnings.catch_warnings(record=True) as caught:
+    warnings.simplefilter("always")
+    ArgPattern(r"(a*)*b")
+    ArgPattern(r"[a-z]+")
+print([str(w.message) for w in caught])
+assert len(caught) == 1 and caught[0].category is RuntimeWarning
+ArgPattern.backtrack_policy = "reject"
+try:
+    ArgPattern(r"(a|a)+b")
+except InvalidParam as e:
+    print(e)
+else:
+    raise AssertionError("InvalidParam not raised")
+finally:
+    ArgPattern.backtrack_policy = "warn"
+with warnings.catch_warnings():
+    warnings.simplefilter("error")
+    ArgPattern.backtrack_policy = "ignore"
+    ArgPattern(r"(a*)*b")
+    ArgPattern.backtrack_policy = "warn"
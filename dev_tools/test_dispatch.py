@@ -0,0 +1,102 @@
+from arclet.alconna import Alconna, Args, Arpamar, command_manager
+from arclet.alconna.manager import MessagePrefilter
+
+print("\nDispatch: header-prefixed and regex commands")
+ns = "TestDispatch"
+weather = Alconna(headers=["!", "/"], command="weather", main_args=Args["city":str], namespace=ns)
+pic = Alconna(command="pic(?:ture)?", main_args=Args["n":int], namespace=ns)
+calc = Alconna(headers=["."], command="calc(\\d)", namespace=ns)
+echo = Alconna(command="echo", main_args=Args["t":str], namespace=ns)
+named = Alconna(command="(?P<x>ab)c", namespace=ns)  # 含命名组的正则单独编译
+for message, header, main_args in (
+    ("!weather 北京", True, {"city": "北京"}),
+    ("/weather 上海", True, {"city": "上海"}),
+    ("picture 3", True, {"n": 3}),
+    ("pic 2", True, {"n": 2}),
+    (".calc1", "1", {}),
+    ("echo hi", True, {"t": "hi"}),
+    ("abc", "ab", {}),
+):
+    res = command_manager.broadcast(message, ns)
+    print(message, res.header, res.main_args)
+    assert res.matched and res.header == header and res.main_args == main_args
+assert command_manager.broadcast(".calc", ns) is None
+assert command_manager.broadcast("nothing here", ns) is None
+assert command_manager.broadcast("echo", ns).matched is False  # 命令头匹配, 参数缺失
+command_manager.set_disable(echo)
+assert command_manager.broadcast("echo hi", ns).matched is False
+command_manager.set_enable(echo)
+assert command_manager.broadcast("echo hi", ns).matched
+
+print("\nDispatch: prefilter")
+
+
+class Plain:
+    def __init__(self, text):
+        self.text = text
+
+
+class At:
+    pass
+
+
+class Source:
+    pass
+
+
+prefilter = MessagePrefilter()
+prefilter.add(weather)
+prefilter.add(Alconna(command="ping", separator=",", namespace="TestPrefilter"))
+for message, expected in (
+    ("!weather x", True),
+    ("  !weather", True),
+    ("\n!weather", True),
+    (",,ping", True),  # 开头的分隔符会在分词时被跳过
+    ("/weat", False),
+    ("weather", False),  # 只有带命令头的形式才能匹配
+    ("chat msg 'x'", False),  # 只有首个 token 中的引号才需要放行
+    ("'!weather'", True),
+    ("", False),
+    ([Source(), Plain("!weather")], True),  # 黑名单中的元素被跳过
+    ([Plain("  "), Plain("ping")], True),
+    ([Plain("chat")], False),
+    ([At()], False),  # 没有命令以元素开头
+):
+    passed = prefilter(message)
+    print(repr(message), passed)
+    assert passed is expected
+assert prefilter.hit == 7 and prefilter.miss == 6
+prefilter.reset_stats()
+prefilter.add_key("天气")  # 快捷命令
+assert prefilter("天气 北京") and not prefilter("今天天气")
+regex_head = Alconna(command="(he|hi)llo", namespace="TestPrefilter")
+prefilter.add(regex_head)  # 命令名以正则开头时, 所有文本消息都会通过
+assert prefilter("random")
+prefilter.remove(regex_head)
+assert not prefilter("random")
+assert prefilter.stats == {"hit": 2, "miss": 2, "hit_rate": 0.5, "miss_rate": 0.5}
+
+command_manager.add_shortcut(echo, "说", "echo hi")
+assert command_manager.prefilter("说") and command_manager.prefilter("  !weather")
+
+print("\nDispatch: broadcast with multi=True")
+roll = Alconna(command="roll", main_args=Args["n":int], namespace="TestMulti")
+roll_regex = Alconna(command="r(oll)?", main_args=Args["n":int]["m":int:6], namespace="TestMulti")
+roll_str = Alconna(command="roll", main_args=Args["s":str], namespace="TestMulti1")
+roll_comma = Alconna(command="roll", main_args=Args["a":str]["b":str], separator=",", namespace="TestMulti2")
+results = command_manager.broadcast("roll 3", multi=True)
+print(results)
+assert isinstance(results, list) and all(isinstance(r, Arpamar) for r in results)
+assert [(r.header, r.main_args) for r in results] == [  # 按注册顺序, 只返回匹配成功的结果
+    (True, {"n": 3}), ("oll", {"n": 3, "m": 6}), (True, {"s": "3"})
+]
+assert [r.main_args for r in command_manager.broadcast("roll 3", "TestMulti", multi=True)] == [
+    {"n": 3}, {"n": 3, "m": 6}
+]
+assert [r.main_args for r in command_manager.broadcast("roll x", multi=True)] == [{"s": "x"}]
+assert [r.main_args for r in command_manager.broadcast("roll,a,b", multi=True)] == [{"a": "a", "b": "b"}]
+assert command_manager.broadcast("roll", multi=True) == []
+assert command_manager.broadcast("nothing", multi=True) == []  # 被预过滤器排除时同样返回空列表
+command_manager.set_disable(roll)
+assert [r.main_args for r in command_manager.broadcast("roll 3", "TestMulti", multi=True)] == [{"n": 3, "m": 6}]
+command_manager.set_enable(roll)
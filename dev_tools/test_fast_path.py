@@ -0,0 +1,63 @@
+import random
+from arclet.alconna import Alconna, Args, Option, AnyUrl
+from arclet.alconna.analysis import compile
+from arclet.alconna.analysis.codegen import compile_regex
+from arclet.alconna.builtin.analyser import CompiledCommandAnalyser, DisorderCommandAnalyser
+
+# 快速路径与通用分析器的差分测试: 同一命令分别使用两种分析器, 对随机拼接的消息比较解析结果
+specs = {
+    "regex": (
+        dict(
+            headers=["!", "/"], command="weather", main_args=Args["city":str, "days":int],
+            options=[Option("--detail|-d"), Option("--quiet|-q")]
+        ),
+        ["!weather", "/weather", "weather"],
+        ["北京", "3", "-1", "2.5", "--detail", "-d", "-q", "--quiet", "-dq", "--help", "'a b'"]
+    ),
+    "regex_head": (
+        dict(command="pic(?:ture)?", main_args=Args["count":int, "url":AnyUrl], options=[Option("-r")]),
+        ["picture", "pic", "pict"],
+        ["3", "x", "https://a.com", "ftp://b", "-r", "-rr", "\\"]
+    ),
+    "regex_flags": (
+        dict(command="ping", options=[Option("--all|-a"), Option("-a4")]),
+        ["ping", "pin"],
+        ["--all", "-a", "-a4", "-a6", "x"]
+    ),
+    "source": (
+        dict(
+            headers=["."], command="calc", main_args=Args["a":int, "b":float:1.0, "?op":str],
+            options=[Option("--round|-r", Args["n":int:2]), Option("--pair", Args["x":int, "y":int]), Option("-v")]
+        ),
+        [".calc", "calc"],
+        ["3", "-1", "2.5", "x", "--round", "-r", "--pair", "-v", "-vv", "true", "\"\""]
+    ),
+}
+count = 10000
+
+if __name__ == "__main__":
+    rand = random.Random(20220501)
+    total = 0
+    for name, (spec, heads, words) in specs.items():
+        generic = Alconna(**spec, analyser_type=DisorderCommandAnalyser)
+        compiled = Alconna(**spec, analyser_type=CompiledCommandAnalyser, namespace="FastPath")
+        analyser = compile(compiled)
+        backend = "regex" if compile_regex(analyser) else "source" if analyser.fast_parse else None
+        assert backend == name.split("_")[0], (name, backend)
+        diffs = matched = 0
+        for _ in range(count):
+            msg = " ".join([rand.choice(heads)] + rand.choices(words, k=rand.randint(0, 4)))
+            results = []
+            for alc in (generic, compiled):
+                try:
+                    res = alc.parse(msg)
+                    results.append((res.matched, res.header, res.main_args, res.options, res.other_args))
+                except Exception as e:
+                    results.append(repr(e))
+            matched += results[0][0] is True
+            if results[0] != results[1]:
+                diffs += 1
+                print(f"{name}: {msg!r}\n  generic: {results[0]}\n  fast:    {results[1]}")
+        print(f"{name}({backend}): {count} messages, {matched} matched, {diffs} diffs")
+        total += diffs
+    assert total == 0
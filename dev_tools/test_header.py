@@ -0,0 +1,47 @@
+import random
+import re
+
+from arclet.alconna import Alconna
+from arclet.alconna.analysis.header import TextHeads
+
+print("\nHeader: overlapping headers keep the declared order")
+alc = Alconna(headers=["!", "!!"], command="(.+)", namespace="TestHeader")
+print(alc.parse("!!x").header)
+assert alc.parse("!!x").header == "!x"  # 与正则 (?:!|!!)(.+) 一致, 先尝试先声明的 "!"
+alc1 = Alconna(headers=["!!", "!"], command="(.+)", namespace="TestHeader1")
+print(alc1.parse("!!x").header)
+assert alc1.parse("!!x").header == "x"
+alc2 = Alconna(headers=["/", "//"], command="cmd(\\d)", namespace="TestHeader")
+assert alc2.parse("//cmd1").header == "1"  # "/" 之后的 "/cmd1" 不匹配命令名, 回退到 "//"
+assert Alconna(headers=["/", "//"], command="(/?cmd)(\\d)", namespace="TestHeader2").parse("//cmd1").header == ("/cmd", "1")
+
+print("\nHeader: differential against the regex alternation")
+
+
+def expect(texts, command, text):
+    """按声明顺序逐个尝试 (?:h1|h2|...)command 的各分支, 捕获为空时视为失配"""
+    for head in texts:
+        pattern = re.compile("^" + re.escape(head) + command + "$")
+        if r := pattern.findall(text):
+            if pattern.groups == 0:
+                return text
+            if r[0]:
+                return r[0]
+    return None
+
+
+random.seed(21)
+alphabet = "!/a"
+commands = ["(.+)", "(a*)(.*)", "a(.*)", "(!?a)", "(.*)a", "[!/]a", "a+"]
+diffs = 0
+for _ in range(3000):
+    texts = ["".join(random.choice(alphabet) for _ in range(random.randint(0, 3))) for _ in range(random.randint(1, 4))]
+    command = random.choice(commands)
+    text = "".join(random.choice(alphabet) for _ in range(random.randint(1, 6)))
+    found = TextHeads(texts, command).find(text)
+    expected = expect(texts, command, text)
+    if found != expected:
+        diffs += 1
+        print(texts, command, text, found, expected)
+print("diffs:", diffs)
+assert diffs == 0
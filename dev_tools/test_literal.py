@@ -0,0 +1,41 @@
+from arclet.alconna import Alconna, Args
+from arclet.alconna.util import parse_literal, split_literal, unquote
+
+print("\nLiteral: nesting")
+res = parse_literal("[1, [2, (3, 4)], {'a': {5, 6}}, ()]")
+print(res)
+assert res == [1, [2, (3, 4)], {"a": {5, 6}}, ()]
+assert parse_literal("(1)") == 1 and parse_literal("(1,)") == (1,) and parse_literal("[1,]") == [1]
+assert parse_literal("{a=1, b: [2]}") == {"a": 1, "b": [2]}
+assert parse_literal("{1, 2}") == {1, 2} and parse_literal("{}") == {}
+assert parse_literal(" [ -3 , +1.5e3 , .5 , True , None , none ] ") == [-3, 1500.0, 0.5, True, None, "none"]
+
+print("\nLiteral: quoted commas")
+res = parse_literal("['a,b', \"c]\", '(d', x y]")
+print(res)
+assert res == ["a,b", "c]", "(d", "x y"]
+assert parse_literal("{'k,1': 'v:2'}") == {"k,1": "v:2"}
+assert split_literal("'a,b', [c, d], e,") == ["'a,b'", "[c, d]", "e"]
+assert split_literal("a: 1, b=[2, 3], c", pairs=True) == [("a", "1"), ("b", "[2, 3]"), ("c", None)]
+
+print("\nLiteral: changes from eval")
+assert parse_literal("[1 2]") == ["1 2"]
+assert parse_literal("0x10") == "0x10" and parse_literal("1_000") == "1_000"
+assert parse_literal("__import__('os')") == "__import__('os')"  # 不会执行任何代码
+
+print("\nLiteral: malformed input")
+for text in ("", "[1, 2", "[1, 2]]", "'abc", "]", "[, 1]", "[1,,2]", "{'a':}", "{1: 2, 3}", "['a]"):
+    try:
+        parse_literal(text)
+    except ValueError as e:
+        print(repr(text), e)
+    else:
+        raise AssertionError(f"{text!r} should be rejected")
+res = Alconna(command="lit", main_args=Args["v":list], namespace="TestLiteral").parse("lit [1,")
+print(res.matched, res.error_info)
+assert res.matched is False
+
+print("\nLiteral: unquote")
+assert unquote("'a'") == "a" and unquote('"a\\"b"') == 'a"b' and unquote("'a\\\\b'") == "a\\b"
+assert unquote("'it\\'s'") == "it's" and parse_literal("'it\\'s'") == "it's"
+assert unquote("'a") == "'a" and unquote("'") == "'" and unquote("a") == "a" and unquote("'a\"") == "'a\""
@@ -6,4 +6,6 @@ print(command_manager.all_command_help(max_length=6, page=3, pages="[%d/%d]"))
 print("\n")
 print(command_manager.broadcast("cmd.北京天气"))
 print(command_manager.require("/pip"))
-print(command_manager.command_help("/pip"))
\ No newline at end of file
+print(command_manager.command_help("/pip"))
+print(command_manager.broadcast("今天天气不错"))
+print(command_manager.prefilter.stats)
@@ -0,0 +1,55 @@
+from arclet.alconna import Alconna, Args, Option, Subcommand
+
+print("\nOption Trie: glued values")
+alc = Alconna(
+    command="trie", namespace="TestTrie",
+    options=[
+        Option("-n", Args["num":int]), Option("-nx", Args["text":str]),
+        Option("--o", Args["text":str]), Option("--out|-o", Args["path":str]), Option("--outline")
+    ]
+)
+res = alc.parse("trie -n123")
+print(res.options)
+assert res.options == {"n": {"num": 123}}
+assert alc.parse("trie -n 123").options == {"n": {"num": 123}}
+assert alc.parse("trie -o123").options == {"out": {"path": "123"}}  # 别名可作为前缀, 名称只能完全匹配
+assert alc.parse("trie -nabc").matched is False  # 粘连的部分仍需通过参数校验
+
+print("\nOption Trie: the longest alias wins over a shorter one")
+res = alc.parse("trie -nx1")
+print(res.options)
+assert res.options == {"nx": {"text": "1"}}
+assert alc.parse("trie -nxy").options == {"nx": {"text": "y"}}
+assert alc.parse("trie --outline").options == {"outline": Ellipsis}
+assert alc.parse("trie --out x").options == {"out": {"path": "x"}}
+assert alc.parse("trie --outb").options == {"o": {"text": "utb"}}  # "--out" 是名称而非别名, 不参与前缀匹配
+assert alc.parse("trie --outlinex").matched is False  # 没有参数的选项不接受粘连
+
+print("\nOption Trie: glued text starting with a separator")
+res = alc.parse('trie "--o a"')
+print(repr(res.options["o"]["text"]))
+assert res.options == {"o": {"text": " a"}}  # 引号内的文本原样保留, 不再按分隔符切分
+assert alc.parse_tokens(["trie", "--o a"]).options == {"o": {"text": " a"}}
+assert alc.parse("trie --o a").options == {"o": {"text": "a"}}
+assert alc.parse('trie "-n 12"').matched is False
+
+print("\nOption Trie: subcommand sub_trie")
+alc1 = Alconna(
+    command="trie1", namespace="TestTrie",
+    options=[
+        Subcommand("sub", [Option("-v"), Option("--val", Args["v":int]), Option("--value", Args["w":int])]),
+        Option("--val", Args["top":str])
+    ]
+)
+res = alc1.parse("trie1 sub --val1")
+print(res.subcommands)
+assert res.subcommands == {"sub": {"val": {"v": 1}}}
+assert alc1.parse("trie1 sub --value2").subcommands == {"sub": {"value": {"w": 2}}}
+assert alc1.parse("trie1 sub --value 2").subcommands == {"sub": {"value": {"w": 2}}}
+assert alc1.parse("trie1 sub -v").subcommands == {"sub": {"v": Ellipsis}}
+res = alc1.parse("trie1 --val1")  # 子命令外使用顶层的前缀树
+assert res.options == {"val": {"top": "1"}} and res.subcommands == {}
+alc1.options[0].options.append(Option("--verbose|-vv"))  # 修改参数后需要重新构造前缀树
+alc1.reset_namespace("TestTrie")
+print(alc1.parse("trie1 sub -vv").subcommands)
+assert alc1.parse("trie1 sub -vv").subcommands == {"sub": {"verbose": Ellipsis}}
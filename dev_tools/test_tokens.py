@@ -0,0 +1,67 @@
+import asyncio
+import sys
+
+from arclet.alconna import Alconna, Args, Option, AnyParam
+from arclet.alconna.builtin.construct import ALCCommand
+
+
+class At:
+    def __init__(self, target):
+        self.target = target
+
+
+class Source:
+    pass
+
+
+print("\nTokens: spaces and empty tokens")
+alc = Alconna(
+    command="tok", main_args=Args["a":str]["b":str:"d"], options=[Option("--x", Args["v":str])], namespace="TestTokens"
+)
+res = alc.parse_tokens(["tok", "hello world"])
+print(res.main_args)
+assert res.main_args == {"a": "hello world", "b": "d"}  # 含空格的 token 仍是一个参数
+assert alc.parse("tok hello world").main_args == {"a": "hello", "b": "world"}
+res = alc.parse_tokens(["tok", "", "x", "", "--x", "a b"])
+print(res.main_args, res.options)
+assert res.main_args == {"a": "x", "b": "d"} and res.options == {"x": {"v": "a b"}}
+assert alc.parse_tokens(["tok", "a", "b", "c"]).matched is False
+assert alc.parse_tokens(["tok"]).matched is False
+
+print("\nTokens: elements")
+alc1 = Alconna(command="poke", main_args=Args["target":AnyParam]["n":int:1], namespace="TestTokens")
+at = At(1)
+res = alc1.parse_tokens(["poke", at, "3"])
+print(res.main_args)
+assert res.main_args == {"target": at, "n": 3}
+assert alc1.parse_tokens([Source(), "poke", at]).main_args == {"target": at, "n": 1}  # 黑名单中的元素被忽略
+
+print("\nTokens: non-default separator")
+alc2 = Alconna(command="sep", main_args=Args["a":str]["b":str], separator=",", namespace="TestTokens")
+res = alc2.parse_tokens(["sep", "x y", "z,w"])
+print(res.main_args)
+assert res.main_args == {"a": "x y", "b": "z,w"}  # token 不会再按分隔符切分
+assert alc2.parse_tokens(["sep,x,y"]).matched is False
+assert alc2.parse("sep,x y,z").main_args == {"a": "x y", "b": "z"}
+
+print("\nTokens: from_commandline")
+received = []
+
+
+def target(a, b, v=None, loop=None):
+    received.append((a, b, v))
+
+
+command = ALCCommand(alc, target, asyncio.new_event_loop())
+argv = sys.argv
+try:
+    sys.argv = ["prog", "hello world", "--x", "v"]
+    command.from_commandline()
+    sys.argv = ["prog", "one", "two"]
+    command.from_commandline()
+    sys.argv = ["prog"]
+    command.from_commandline()  # 解析失败时不执行
+finally:
+    sys.argv = argv
+print(received)
+assert received == [("hello world", "d", "v"), ("one", "two", None)]
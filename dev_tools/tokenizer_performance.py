@@ -0,0 +1,38 @@
+import time
+from arclet.alconna.util import split, split_once, _split_chars, _split_once_chars
+
+samples = {
+    "plain": ".test --foo 123 --bar baz qux",
+    "long": " ".join(str(i) for i in range(500)),
+    "lines": ".test foo\nbar baz\nqux",
+    "quoted": '.test "hello world" --foo \'a b\'',
+}
+count = 20000
+
+if __name__ == "__main__":
+    for name, text in samples.items():
+        loop = count if name != "long" else count // 50
+        st = time.perf_counter()
+        for _ in range(loop):
+            _split_chars(text, " ")
+        ed = time.perf_counter()
+        old = loop / (ed - st)
+        st = time.perf_counter()
+        for _ in range(loop):
+            split(text, " ")
+        ed = time.perf_counter()
+        new = loop / (ed - st)
+        print(f"split[{name}]: legacy {old:.2f}msg/s, current {new:.2f}msg/s, x{new / old:.2f}")
+
+    text = samples["plain"]
+    st = time.perf_counter()
+    for _ in range(count):
+        _split_once_chars(text, "-")
+    ed = time.perf_counter()
+    old = count / (ed - st)
+    st = time.perf_counter()
+    for _ in range(count):
+        split_once(text, "-")
+    ed = time.perf_counter()
+    new = count / (ed - st)
+    print(f"split_once: legacy {old:.2f}msg/s, current {new:.2f}msg/s, x{new / old:.2f}")
@@ -0,0 +1,21 @@
+import time
+from arclet.alconna import Alconna, Args, Option
+
+alc = Alconna(
+    command="deploy",
+    options=[Option("--env|-e", Args["env":str]), Option("--tag|-t", Args["tag":str])],
+    main_args=Args["service":str, "replicas":int]
+)
+argv = ["deploy", "web", "3", "--env", "production", "--tag", "v1.2.3"]
+count = 20000
+
+if __name__ == "__main__":
+    st = time.perf_counter()
+    for _ in range(count):
+        alc.parse(" ".join(argv))
+    mid = time.perf_counter()
+    for _ in range(count):
+        alc.parse_tokens(argv)
+    ed = time.perf_counter()
+    print(f"join + parse: {count / (mid - st):.2f}msg/s, parse_tokens: {count / (ed - mid):.2f}msg/s")
+    print(alc.parse_tokens(["deploy", "web app", "3", "--tag", "release candidate"]).all_matched_args)